@@ -1,23 +1,20 @@
 import streamlit as st
 import pandas as pd
+from application_pages.simulation_engine import LOG_COLUMNS
+from application_pages.interaction import timed_interaction, render_interaction_timings
 
-# Initialize all session state variables at the top of your main app
-if 'synthetic_data' not in st.session_state:
-    st.session_state['synthetic_data'] = pd.DataFrame()
-
-if 'simulation_log' not in st.session_state:
-    # Initialize with expected columns to avoid KeyError
-    st.session_state['simulation_log'] = pd.DataFrame(columns=[
-        'Scenario ID', 'Timestamp', 'Action', 'Impact', 'Risk_Level', 
-        # Add other expected columns based on your application
-    ])
-
-# Add other potential session state variables
-if 'risk_appetite_thresholds' not in st.session_state:
-    st.session_state['risk_appetite_thresholds'] = {}
-
-if 'simulation_results' not in st.session_state:
-    st.session_state['simulation_results'] = pd.DataFrame()
+# Initialize all session state variables once per session, before any page is imported
+if not st.session_state.get('_session_initialized'):
+    st.session_state.setdefault('synthetic_data', pd.DataFrame())
+    st.session_state.setdefault('simulation_log', pd.DataFrame(columns=LOG_COLUMNS))
+    st.session_state.setdefault('risk_appetite_thresholds', {
+        'Max Acceptable Financial Loss per Incident': 0.0,
+        'Max Acceptable Incidents per Period': 0,
+        'Max Acceptable Reputational Impact Score': 0.0
+    })
+    st.session_state.setdefault('risk_appetite_rules', [])
+    st.session_state.setdefault('simulation_results', pd.DataFrame())
+    st.session_state['_session_initialized'] = True
 
 st.set_page_config(page_title="QuLab: Risk Appetite & Governance Simulator", layout="wide")
 st.sidebar.image("https://www.quantuniversity.com/assets/img/logo5.jpg")
@@ -30,29 +27,32 @@ page = st.sidebar.selectbox(
     options=["Data Generation & Risk Appetite", "Scenario Simulation", "Impact Analysis"]
 )
 
-if page == "Data Generation & Risk Appetite":
-    st.markdown("""
+with timed_interaction(f"Full page run: {page}"):
+    if page == "Data Generation & Risk Appetite":
+        st.markdown("""
+
+        This interactive application empowers you to explore and simulate risk management strategies tailored to your organization's risk appetite.  
+        Key features include:
 
-    This interactive application empowers you to explore and simulate risk management strategies tailored to your organization's risk appetite.  
-    Key features include:
+        - **Synthetic Risk Scenario Generation:** Create realistic risk scenarios to test your risk management framework.
+        - **Risk Appetite Definition:** Set and adjust risk appetite thresholds to align with your firm's governance policies.
+        - **Scenario Simulation:** Apply risk management actions and observe their effects on simulated scenarios.
+        - **Impact Analysis & Visualization:** Gain insights into the effectiveness of your strategies through dynamic visualizations and detailed logs.
 
-    - **Synthetic Risk Scenario Generation:** Create realistic risk scenarios to test your risk management framework.
-    - **Risk Appetite Definition:** Set and adjust risk appetite thresholds to align with your firm's governance policies.
-    - **Scenario Simulation:** Apply risk management actions and observe their effects on simulated scenarios.
-    - **Impact Analysis & Visualization:** Gain insights into the effectiveness of your strategies through dynamic visualizations and detailed logs.
+        Use the sidebar to navigate between modules. Start by generating data and defining your risk appetite, then proceed to simulate scenarios and analyze their impact.
 
-    Use the sidebar to navigate between modules. Start by generating data and defining your risk appetite, then proceed to simulate scenarios and analyze their impact.
+        ---
+        """)
+        from application_pages.page1 import run_page1
+        run_page1()
+    elif page == "Scenario Simulation":
+        from application_pages.page2 import run_page2
+        run_page2()
+    elif page == "Impact Analysis":
+        from application_pages.page3 import run_page3
+        run_page3()
 
-    ---
-    """)
-    from application_pages.page1 import run_page1
-    run_page1()
-elif page == "Scenario Simulation":
-    from application_pages.page2 import run_page2
-    run_page2()
-elif page == "Impact Analysis":
-    from application_pages.page3 import run_page3
-    run_page3()
+render_interaction_timings()
 
 # License
 st.caption('''
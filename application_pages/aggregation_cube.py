@@ -0,0 +1,91 @@
+import pandas as pd
+import numpy as np
+from itertools import combinations
+
+CUBE_DIMENSIONS = ['Risk Category', 'Chosen Action', 'Business Unit', 'Sub-Category', 'Period']
+
+# Additive measures: every rollup is a sum, so coarser cuboids can be built from finer ones
+CUBE_MEASURES = {
+    'Scenarios': None,
+    'Residual Financial Impact': 'Residual Financial Impact',
+    'Residual Reputational Impact': 'Residual Reputational Impact',
+    'Residual Operational Impact': 'Residual Operational Impact',
+    'Financial Compliant': 'Financial Compliance',
+    'Operational Compliant': 'Operational Compliance',
+    'Reputational Compliant': 'Reputational Compliance',
+}
+
+
+def build_aggregation_cube(simulation_log, dimensions=CUBE_DIMENSIONS):
+    """
+    Precomputes rollups of every measure for every subset of `dimensions`.
+    Only the finest cuboid scans the log; each coarser cuboid is rolled up from its smallest
+    already-computed parent. Dimensions missing from the log are filled with 'Unassigned'.
+    Returns a dictionary holding the dimensions, measure names and the cuboids keyed by frozenset of dimensions.
+    """
+    dimensions = list(dimensions)
+    base = pd.DataFrame(index=simulation_log.index)
+    for dimension in dimensions:
+        if dimension in simulation_log.columns:
+            base[dimension] = simulation_log[dimension].astype(object).where(simulation_log[dimension].notna(), 'Unassigned')
+        else:
+            base[dimension] = 'Unassigned'
+    for measure, source in CUBE_MEASURES.items():
+        if source is None:
+            base[measure] = 1
+        elif source not in simulation_log.columns:
+            base[measure] = 0.0
+        elif source.endswith('Compliance'):
+            base[measure] = simulation_log[source].eq(True).astype(int)
+        else:
+            base[measure] = pd.to_numeric(simulation_log[source], errors='coerce').fillna(0.0)
+
+    measures = list(CUBE_MEASURES)
+    cuboids = {frozenset(dimensions): _rollup(base, dimensions, measures)}
+
+    for size in range(len(dimensions) - 1, -1, -1):
+        for subset in combinations(dimensions, size):
+            key = frozenset(subset)
+            parents = [cuboids[key | {dimension}] for dimension in dimensions if dimension not in key]
+            parent = min(parents, key=len)
+            cuboids[key] = _rollup(parent, list(subset), measures)
+
+    return {'dimensions': dimensions, 'measures': measures, 'cuboids': cuboids}
+
+
+def _rollup(frame, group_by, measures):
+    """Sums `measures` over `group_by`; an empty `group_by` gives the single grand-total row."""
+    if not group_by:
+        return frame[measures].sum().to_frame().T
+    return frame.groupby(group_by, sort=True, observed=True)[measures].sum().reset_index()
+
+
+def query_cube(cube, group_by=(), filters=None):
+    """
+    Answers a slice/dice/drill-down query from the precomputed cuboids, without touching the raw log.
+    `group_by` lists the dimensions to break down by and `filters` maps dimensions to allowed values
+    (an empty list keeps every value). Returns a DataFrame of the summed measures per group.
+    """
+    group_by = list(group_by)
+    filters = {dimension: values for dimension, values in (filters or {}).items() if values}
+    unknown = set(group_by).union(filters).difference(cube['dimensions'])
+    if unknown:
+        raise KeyError(f"Unknown cube dimensions: {sorted(unknown)}")
+
+    cuboid = cube['cuboids'][frozenset(group_by).union(filters)]
+    if filters:
+        mask = np.ones(len(cuboid), dtype=bool)
+        for dimension, values in filters.items():
+            mask &= cuboid[dimension].isin(values).to_numpy()
+        cuboid = cuboid[mask]
+        # Filtered dimensions that are not broken down are summed away on the (small) cuboid
+        if set(filters).difference(group_by):
+            cuboid = _rollup(cuboid, group_by, cube['measures'])
+
+    columns = group_by + cube['measures']
+    return cuboid[columns].reset_index(drop=True)
+
+
+def dimension_values(cube, dimension):
+    """Lists the values of one dimension, read from its one-dimensional cuboid."""
+    return cube['cuboids'][frozenset([dimension])][dimension].tolist()
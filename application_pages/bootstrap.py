@@ -0,0 +1,110 @@
+import pandas as pd
+import numpy as np
+
+# Upper bound on entries of the (resamples x bins) weight matrix held in memory at once
+MAX_WEIGHTS_PER_CHUNK = 2 ** 22
+
+
+def _group_bins(values, codes, num_groups, max_bins_per_group):
+    """
+    Splits each group's rows, sorted by value, into at most `max_bins_per_group` contiguous bins.
+    Groups with no more rows than that keep one row per bin. Returns per-bin row counts, means and
+    within-bin standard deviations, plus the index of each group's first bin (bins are ordered by group).
+    """
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+    group_sizes = np.bincount(sorted_codes, minlength=num_groups)
+    group_starts = np.concatenate(([0], np.cumsum(group_sizes)[:-1]))
+
+    rank = np.arange(len(sorted_values)) - group_starts[sorted_codes]
+    bins_per_group = np.minimum(group_sizes, max_bins_per_group)
+    bin_starts = np.concatenate(([0], np.cumsum(bins_per_group)[:-1]))
+    bin_ids = bin_starts[sorted_codes] + rank * bins_per_group[sorted_codes] // np.maximum(group_sizes[sorted_codes], 1)
+
+    num_bins = int(bins_per_group.sum())
+    counts = np.bincount(bin_ids, minlength=num_bins).astype(float)
+    means = np.bincount(bin_ids, weights=sorted_values, minlength=num_bins) / counts
+    squares = np.bincount(bin_ids, weights=sorted_values ** 2, minlength=num_bins) / counts
+    stds = np.sqrt(np.maximum(squares - means ** 2, 0.0))
+    return counts, means, stds, bin_starts, group_sizes
+
+
+def bootstrap_group_totals(values, codes, num_groups, num_resamples=1000, confidence=0.95,
+                           max_bins_per_group=256, seed=None):
+    """
+    Bootstrap percentile confidence intervals for the total of `values` within each group.
+
+    Resamples are drawn in batch as a (resamples x bins) matrix of Poisson resampling weights rather than a loop
+    over resamples. Groups with at most `max_bins_per_group` rows get one weight per row, i.e. an exact Poisson
+    bootstrap. Larger groups are split into value-sorted bins: a bin of n rows receives a Poisson(n) count, and
+    the sum of its resampled rows is moment-matched (count x bin mean plus normal noise with the within-bin spread).
+    Each resampled total is rescaled to the observed group size, so the interval reflects uncertainty in the
+    per-scenario losses rather than in how many scenarios were logged.
+
+    Returns (totals, lower, upper) arrays of length `num_groups`.
+    """
+    if num_resamples < 2:
+        raise ValueError("num_resamples must be at least 2.")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+    values = np.asarray(values, dtype=float)
+    codes = np.asarray(codes)
+
+    rng = np.random.default_rng(seed)
+    counts, means, stds, bin_starts, group_sizes = _group_bins(values, codes, num_groups, max_bins_per_group)
+    totals = np.bincount(codes, weights=values, minlength=num_groups)
+    has_spread = stds > 0
+    occupied = group_sizes > 0
+
+    resampled = np.empty((num_resamples, num_groups))
+    chunk = max(1, MAX_WEIGHTS_PER_CHUNK // max(len(counts), 1))
+    for start in range(0, num_resamples, chunk):
+        size = min(chunk, num_resamples - start)
+        weights = rng.poisson(counts, size=(size, len(counts))).astype(float)
+        bin_sums = weights * means
+        if has_spread.any():
+            bin_sums[:, has_spread] += np.sqrt(weights[:, has_spread]) * stds[has_spread] * \
+                rng.standard_normal((size, int(has_spread.sum())))
+        group_sums = np.zeros((size, num_groups))
+        group_counts = np.zeros((size, num_groups))
+        group_sums[:, occupied] = np.add.reduceat(bin_sums, bin_starts[occupied], axis=1)
+        group_counts[:, occupied] = np.add.reduceat(weights, bin_starts[occupied], axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            resampled[start:start + size] = np.where(group_counts > 0, group_sums / group_counts, np.nan) * group_sizes
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(resampled, [alpha, 1 - alpha], axis=0)
+    return totals, lower, upper
+
+
+def bootstrap_aggregate_results(simulation_log, group_columns=('Risk Category', 'Chosen Action'),
+                                value_column='Residual Financial Impact', num_resamples=1000,
+                                confidence=0.95, seed=None):
+    """
+    Groups the `simulation_log` like `aggregate_results` and adds bootstrap confidence bounds
+    ('CI Lower', 'CI Upper') to each group's total `value_column`.
+    """
+    group_columns = list(group_columns)
+    if simulation_log.empty:
+        return pd.DataFrame()
+    missing = set(group_columns + [value_column]).difference(simulation_log.columns)
+    if missing:
+        raise KeyError(f"Missing expected columns for aggregation: {sorted(missing)}")
+
+    values = pd.to_numeric(simulation_log[value_column], errors='coerce')
+    valid = values.notna().to_numpy()
+    if not valid.any():
+        return pd.DataFrame()
+    groups = simulation_log.loc[valid, group_columns]
+    codes, uniques = pd.MultiIndex.from_frame(groups).factorize()
+
+    totals, lower, upper = bootstrap_group_totals(
+        values.to_numpy()[valid], codes, len(uniques), num_resamples=num_resamples,
+        confidence=confidence, seed=seed
+    )
+    result = pd.DataFrame(list(uniques), columns=group_columns)
+    result[value_column] = totals
+    result['CI Lower'] = lower
+    result['CI Upper'] = upper
+    return result.sort_values(group_columns).reset_index(drop=True)
@@ -0,0 +1,145 @@
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc, t as student_t
+
+SAMPLERS = ['pseudo', 'antithetic', 'sobol']
+TARGETS = ['portfolio_loss', 'breach_rate']
+
+# Upper bound on uniforms held in memory at once while evaluating a batch of trials
+MAX_UNIFORMS_PER_BLOCK = 2 ** 22
+
+
+def new_running_stats():
+    """Creates an empty Welford accumulator."""
+    return {'count': 0, 'mean': 0.0, 'm2': 0.0}
+
+
+def update_running_stats(stats, values):
+    """
+    Folds a batch of observations into a Welford accumulator, using the pairwise (Chan et al.) merge
+    so a whole batch is combined in one step instead of a Python loop.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return stats
+    batch_count = values.size
+    batch_mean = float(values.mean())
+    batch_m2 = float(np.square(values - batch_mean).sum())
+
+    count = stats['count'] + batch_count
+    delta = batch_mean - stats['mean']
+    stats['mean'] += delta * batch_count / count
+    stats['m2'] += batch_m2 + delta ** 2 * stats['count'] * batch_count / count
+    stats['count'] = count
+    return stats
+
+
+def confidence_half_width(stats, confidence=0.95):
+    """
+    Half-width of the Student-t confidence interval for the mean held in `stats`
+    (t rather than normal, since Sobol' runs may only have a handful of replicates).
+    """
+    if stats['count'] < 2:
+        return np.inf
+    variance = stats['m2'] / (stats['count'] - 1)
+    return student_t.ppf(0.5 + confidence / 2, stats['count'] - 1) * np.sqrt(variance / stats['count'])
+
+
+def _trial_values(uniforms, likelihood, financial_impact, target, max_incidents, severity_sigma):
+    """
+    Evaluates one trial per row of `uniforms`: the first block of columns decides which scenarios occur,
+    the optional second block draws a lognormal severity multiplier (mean one) for each scenario.
+    """
+    num_scenarios = len(likelihood)
+    occurred = uniforms[:, :num_scenarios] < likelihood
+    if target == 'breach_rate':
+        return (occurred.sum(axis=1) > max_incidents).astype(float)
+    if severity_sigma > 0:
+        severity = np.exp(severity_sigma * ndtri(uniforms[:, num_scenarios:]) - severity_sigma ** 2 / 2)
+        return (occurred * severity) @ financial_impact
+    return occurred.astype(float) @ financial_impact
+
+
+def simulate_until_converged(likelihood, financial_impact, target='portfolio_loss', max_incidents=None,
+                             sampler='pseudo', rel_tol=0.01, abs_tol=0.0, confidence=0.95,
+                             batch_size=256, max_trials=1_000_000, severity_sigma=0.0, seed=None):
+    """
+    Simulates portfolio periods until the estimate reaches the requested precision.
+
+    Each trial draws, for every scenario, whether it occurs (with its likelihood) and, if `severity_sigma` > 0,
+    a lognormal severity multiplier. The target is the expected portfolio loss per period or the breach rate,
+    i.e. the probability that more than `max_incidents` incidents occur in a period.
+
+    Samplers:
+    *   'pseudo': independent pseudo-random trials;
+    *   'antithetic': trials in pairs (u, 1 - u), each pair average counting as one observation;
+    *   'sobol': each batch is a freshly scrambled Sobol' sequence and its mean counts as one observation,
+        so the confidence interval stays valid across independent randomizations.
+
+    Sampling stops once the confidence half-width is within max(abs_tol, rel_tol * |estimate|)
+    or `max_trials` is reached. Returns a dictionary with the estimate, its interval and the trials used.
+    """
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{sampler}'. Use one of {SAMPLERS}.")
+    if target not in TARGETS:
+        raise ValueError(f"Unknown target '{target}'. Use one of {TARGETS}.")
+    if target == 'breach_rate' and max_incidents is None:
+        raise ValueError("max_incidents is required for the breach rate target.")
+    if batch_size < 2 or batch_size & (batch_size - 1):
+        raise ValueError("batch_size must be a power of two (Sobol' balance) of at least 2.")
+
+    likelihood = np.asarray(likelihood, dtype=float)
+    financial_impact = np.asarray(financial_impact, dtype=float)
+    num_scenarios = len(likelihood)
+    if num_scenarios == 0:
+        raise ValueError("At least one scenario is required.")
+    dim = num_scenarios * (2 if severity_sigma > 0 and target == 'portfolio_loss' else 1)
+    if sampler == 'sobol' and dim > qmc.Sobol.MAXDIM:
+        raise ValueError(f"Sobol' sampling supports at most {qmc.Sobol.MAXDIM} dimensions, got {dim}.")
+    # The smallest block is one pair of trials, which must still fit the memory cap
+    if 2 * dim > MAX_UNIFORMS_PER_BLOCK:
+        raise ValueError(
+            f"Simulating periods supports at most {MAX_UNIFORMS_PER_BLOCK // 2} uniforms per trial, got {dim}; "
+            "simulate a subset of the scenarios instead."
+        )
+
+    rng = np.random.default_rng(seed)
+    block_size = min(batch_size, 2 ** int(np.log2(MAX_UNIFORMS_PER_BLOCK // dim)))
+    stats = new_running_stats()
+    trials_used = 0
+    half_width = np.inf
+
+    def evaluate(uniforms):
+        return _trial_values(uniforms, likelihood, financial_impact, target, max_incidents, severity_sigma)
+
+    while trials_used < max_trials:
+        if sampler == 'sobol':
+            engine = qmc.Sobol(d=dim, scramble=True, seed=rng)
+            batch_total = 0.0
+            for _ in range(batch_size // block_size):
+                batch_total += evaluate(engine.random(block_size)).sum()
+            update_running_stats(stats, [batch_total / batch_size])
+        else:
+            for _ in range(batch_size // block_size):
+                uniforms = rng.random((block_size // 2 if sampler == 'antithetic' else block_size, dim))
+                if sampler == 'antithetic':
+                    update_running_stats(stats, (evaluate(uniforms) + evaluate(1.0 - uniforms)) / 2)
+                else:
+                    update_running_stats(stats, evaluate(uniforms))
+        trials_used += batch_size
+
+        half_width = confidence_half_width(stats, confidence)
+        if half_width <= max(abs_tol, rel_tol * abs(stats['mean'])):
+            break
+
+    converged = half_width <= max(abs_tol, rel_tol * abs(stats['mean']))
+    return {
+        'Target': target,
+        'Sampler': sampler,
+        'Estimate': stats['mean'],
+        'CI Lower': stats['mean'] - half_width,
+        'CI Upper': stats['mean'] + half_width,
+        'Half Width': half_width,
+        'Trials Used': trials_used,
+        'Converged': bool(converged),
+    }
@@ -0,0 +1,152 @@
+import pandas as pd
+import numpy as np
+
+EMPIRICAL_COLUMNS = [
+    'Initial Likelihood', 'Initial Impact (Financial)', 'Initial Impact (Reputational)', 'Initial Impact (Operational)'
+]
+EMPIRICAL_DIMENSIONS = ['Business Unit', 'Sub-Category', 'Period']
+
+
+def build_alias_table(weights):
+    """
+    Vose's alias method: precomputes (prob, alias) arrays so that drawing from the discrete
+    distribution `weights` takes one uniform index and one comparison per draw.
+    """
+    weights = np.asarray(weights, dtype=float)
+    if weights.size == 0 or (weights < 0).any() or not weights.sum() > 0:
+        raise ValueError("Alias table weights must be non-negative with a positive total.")
+    scaled = weights * len(weights) / weights.sum()
+    prob = np.ones(len(weights))
+    alias = np.arange(len(weights))
+    small = [i for i in range(len(weights)) if scaled[i] < 1.0]
+    large = [i for i in range(len(weights)) if scaled[i] >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Leftovers are 1 up to rounding error
+    return prob, alias
+
+
+def sample_alias(prob, alias, size, rng, offsets=None, sizes=None):
+    """
+    Draws `size` indices from an alias table. With `offsets`/`sizes` (one entry per draw), each draw uses the
+    table stored at prob[offsets:offsets + sizes], and `alias` holds global indices into the stacked tables.
+    """
+    if offsets is None:
+        offsets, sizes = 0, len(prob)
+    slot = offsets + np.minimum((rng.random(size) * sizes).astype(np.int64), np.asarray(sizes) - 1)
+    return np.where(rng.random(size) < prob[slot], slot, alias[slot])
+
+
+def fit_empirical_model(history, num_knots=1024):
+    """
+    Fits per-'Risk Category' empirical distributions to a history of scenarios with the synthetic data columns.
+    Categories get an alias table weighted by their frequency, and each category an alias table over the
+    (Business Unit, Sub-Category, Period) combinations seen for it (missing dimensions become 'Unassigned').
+    Each numeric column gets a (categories x num_knots) table of quantiles on a uniform probability grid:
+    linearly interpolated for continuous columns and a step function for integer-valued ones.
+    """
+    missing = {'Risk Category', *EMPIRICAL_COLUMNS}.difference(history.columns)
+    if missing:
+        raise KeyError(f"History is missing columns: {sorted(missing)}")
+    if num_knots < 2:
+        raise ValueError("num_knots must be at least 2.")
+    history = history.dropna(subset=['Risk Category'])
+    if history.empty:
+        raise ValueError("History has no scenarios with a risk category.")
+
+    frame = pd.DataFrame({'Risk Category': history['Risk Category'].astype(str)})
+    for dimension in EMPIRICAL_DIMENSIONS:
+        frame[dimension] = history[dimension].astype(str).where(history[dimension].notna(), 'Unassigned') \
+            if dimension in history.columns else 'Unassigned'
+
+    combos = frame.groupby(['Risk Category'] + EMPIRICAL_DIMENSIONS, sort=True).size().reset_index(name='Count')
+    category_codes, categories = pd.factorize(combos['Risk Category'], sort=True)
+    category_counts = np.bincount(category_codes, weights=combos['Count'].to_numpy(dtype=float))
+    category_prob, category_alias = build_alias_table(category_counts)
+
+    # Combinations are sorted by category, so each category's alias table is a contiguous block
+    combo_sizes = np.bincount(category_codes, minlength=len(categories))
+    combo_offsets = np.concatenate(([0], np.cumsum(combo_sizes)[:-1]))
+    combo_prob = np.empty(len(combos))
+    combo_alias = np.empty(len(combos), dtype=np.int64)
+    for c in range(len(categories)):
+        block = slice(combo_offsets[c], combo_offsets[c] + combo_sizes[c])
+        combo_prob[block], local_alias = build_alias_table(combos['Count'].to_numpy(dtype=float)[block])
+        combo_alias[block] = local_alias + combo_offsets[c]
+    dimension_codes, dimension_values = {}, {}
+    for dimension in EMPIRICAL_DIMENSIONS:
+        dimension_codes[dimension], dimension_values[dimension] = pd.factorize(combos[dimension], sort=True)
+
+    grid = np.linspace(0.0, 1.0, num_knots)
+    midpoints = (np.arange(num_knots) + 0.5) / num_knots
+    row_categories = frame['Risk Category'].to_numpy()
+    quantiles, discrete = {}, {}
+    for column in EMPIRICAL_COLUMNS:
+        values = pd.to_numeric(history[column], errors='coerce').to_numpy(dtype=float)
+        finite = np.isfinite(values)
+        discrete[column] = bool(finite.any() and np.all(values[finite] == np.round(values[finite])))
+        table = np.empty((len(categories), num_knots))
+        for c, category in enumerate(categories):
+            category_values = values[(row_categories == category) & finite]
+            if category_values.size == 0:
+                raise ValueError(f"No valid '{column}' values for risk category '{category}'.")
+            if discrete[column]:
+                table[c] = np.quantile(category_values, midpoints, method='inverted_cdf')
+            else:
+                table[c] = np.quantile(category_values, grid)
+        quantiles[column] = table
+
+    return {
+        'categories': np.asarray(categories),
+        'category_table': (category_prob, category_alias),
+        'combo_table': (combo_prob, combo_alias, combo_offsets, combo_sizes),
+        'dimension_codes': dimension_codes,
+        'dimension_values': dimension_values,
+        'quantiles': quantiles,
+        'discrete': discrete,
+        'num_knots': num_knots,
+    }
+
+
+def generate_from_history(model, num_scenarios, seed=None):
+    """
+    Generates scenarios shaped like the fitted history, with the columns of `generate_synthetic_data`.
+    Every draw is a constant-time table lookup: alias tables for the category and its dimension combination,
+    and inverse-CDF tables for the numeric columns (drawn independently within a category).
+    Categorical columns are returned as pandas Categoricals.
+    """
+    rng = np.random.default_rng(seed)
+    num_knots = model['num_knots']
+    category_prob, category_alias = model['category_table']
+    category_codes = sample_alias(category_prob, category_alias, num_scenarios, rng)
+    combo_prob, combo_alias, combo_offsets, combo_sizes = model['combo_table']
+    combos = sample_alias(
+        combo_prob, combo_alias, num_scenarios, rng,
+        offsets=combo_offsets[category_codes], sizes=combo_sizes[category_codes]
+    )
+
+    data = {
+        'Scenario ID': np.arange(1, num_scenarios + 1),
+        'Risk Category': pd.Categorical.from_codes(category_codes, categories=model['categories']),
+    }
+    row_offsets = category_codes * num_knots
+    for column in EMPIRICAL_COLUMNS:
+        flat = model['quantiles'][column].ravel()
+        if model['discrete'][column]:
+            slot = np.minimum((rng.random(num_scenarios) * num_knots).astype(np.int64), num_knots - 1)
+            data[column] = flat[row_offsets + slot]
+        else:
+            position = rng.random(num_scenarios) * (num_knots - 1)
+            slot = np.minimum(position.astype(np.int64), num_knots - 2)
+            lower = flat[row_offsets + slot]
+            data[column] = lower + (position - slot) * (flat[row_offsets + slot + 1] - lower)
+    for dimension in EMPIRICAL_DIMENSIONS:
+        data[dimension] = pd.Categorical.from_codes(
+            model['dimension_codes'][dimension][combos], categories=model['dimension_values'][dimension]
+        )
+
+    return pd.DataFrame(data)
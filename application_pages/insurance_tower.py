@@ -0,0 +1,116 @@
+from collections.abc import Mapping
+import pandas as pd
+import numpy as np
+
+# A layer pays `Share (%)` of the loss above `Attachment ($)`, up to `Limit ($)` per scenario and
+# `Aggregate Limit ($)` in total across scenarios; a missing/empty limit is unlimited
+LAYER_FIELDS = ['Attachment ($)', 'Limit ($)', 'Share (%)', 'Aggregate Limit ($)']
+
+EXAMPLE_TOWER = pd.DataFrame([
+    {'Attachment ($)': 5000.0, 'Limit ($)': 20000.0, 'Share (%)': 1.0, 'Aggregate Limit ($)': np.nan},
+    {'Attachment ($)': 25000.0, 'Limit ($)': 50000.0, 'Share (%)': 0.8, 'Aggregate Limit ($)': 2_000_000.0},
+    {'Attachment ($)': 75000.0, 'Limit ($)': np.nan, 'Share (%)': 0.5, 'Aggregate Limit ($)': 1_000_000.0},
+], columns=LAYER_FIELDS)
+
+
+def tower_from_params(action_params):
+    """
+    Returns the insurance tower for the Transfer action: `action_params['Insurance Tower']` if given, otherwise
+    a single unlimited layer attaching at the deductible and sharing the coverage ratio of the loss above it.
+    """
+    if action_params.get('Insurance Tower') is not None:
+        return action_params['Insurance Tower']
+    return [{
+        'Attachment ($)': action_params.get('Insurance Deductible ($)', 0.0),
+        'Limit ($)': None,
+        'Share (%)': action_params.get('Insurance Coverage Ratio (%)', 0.0),
+        'Aggregate Limit ($)': None,
+    }]
+
+
+def validate_tower(tower):
+    """
+    Normalizes a tower (list of layer dictionaries or a DataFrame with LAYER_FIELDS) into a list of layers with
+    numeric values, missing limits as infinity. Layer values may be arrays that broadcast against the losses.
+    Raises ValueError for malformed towers or layers, negative amounts or shares outside [0, 1].
+    """
+    if isinstance(tower, pd.DataFrame):
+        tower = tower.to_dict(orient='records')
+    if not isinstance(tower, (list, tuple)):
+        raise ValueError("An insurance tower must be a list of layers.")
+    layers = []
+    for layer in tower:
+        if not isinstance(layer, Mapping):
+            raise ValueError(f"Every tower layer must map {LAYER_FIELDS} to values.")
+        values = {}
+        for field in LAYER_FIELDS:
+            value = layer.get(field)
+            if value is None or (np.isscalar(value) and pd.isna(value)):
+                value = 0.0 if field in ('Attachment ($)', 'Share (%)') else np.inf
+            values[field] = np.asarray(value, dtype=float)
+        if any((values[field] < 0).any() for field in LAYER_FIELDS):
+            raise ValueError("Tower attachments, limits and aggregate limits must be non-negative.")
+        if (values['Share (%)'] > 1).any():
+            raise ValueError("Layer shares must be between 0 and 1.")
+        layers.append(values)
+    return layers
+
+
+def tower_payouts(financial, tower, aggregate_used=None):
+    """
+    Vectorized payouts of every layer of `tower` for the losses in `financial` (scenarios along the last axis).
+    Each layer pays share x clip(loss - attachment, 0, limit) per scenario; layers with an aggregate limit pay
+    min(cumulative, aggregate) - min(previous cumulative, aggregate), taking scenarios in order.
+    `aggregate_used` carries each layer's cumulative payouts from earlier chunks of scenarios.
+    Returns (payouts array of shape (layers,) + financial.shape, updated aggregate_used list).
+    """
+    financial = np.atleast_1d(np.asarray(financial, dtype=float))
+    layers = validate_tower(tower)
+    if aggregate_used is None:
+        aggregate_used = [0.0] * len(layers)
+    shape = np.broadcast_shapes(financial.shape, *[layer[field].shape for layer in layers for field in LAYER_FIELDS])
+    payouts = np.empty((len(layers),) + shape)
+    updated_used = []
+    for i, layer in enumerate(layers):
+        occurrence = layer['Share (%)'] * np.clip(financial - layer['Attachment ($)'], 0.0, layer['Limit ($)'])
+        occurrence = np.broadcast_to(occurrence, shape)
+        used = np.broadcast_to(aggregate_used[i], shape[:-1] + (1,))
+        if np.isinf(layer['Aggregate Limit ($)']).all():
+            payouts[i] = occurrence
+            updated_used.append(used + occurrence.sum(axis=-1, keepdims=True))
+            continue
+        cumulative = used + np.cumsum(occurrence, axis=-1)
+        payouts[i] = np.diff(np.minimum(cumulative, layer['Aggregate Limit ($)']), axis=-1,
+                             prepend=np.minimum(used, layer['Aggregate Limit ($)']))
+        updated_used.append(cumulative[..., -1:])
+    return payouts, updated_used
+
+
+def apply_tower(financial, tower):
+    """Residual financial impact after the tower's recoveries."""
+    payouts, _ = tower_payouts(financial, tower)
+    return np.maximum(financial - payouts.sum(axis=0), 0.0)
+
+
+def price_tower(scenarios, tower):
+    """
+    Prices each layer of `tower` over every scenario at once, taking scenarios in order against aggregate limits.
+    Returns one row per layer with its expected (likelihood-weighted) payout, the total payout if every scenario
+    occurred, how often the layer is reached and whether its aggregate limit is exhausted.
+    """
+    financial = scenarios['Initial Impact (Financial)'].to_numpy(dtype=float)
+    likelihood = scenarios['Initial Likelihood'].to_numpy(dtype=float)
+    layers = validate_tower(tower)
+    payouts, used = tower_payouts(financial, layers)
+
+    rows = []
+    for i, layer in enumerate(layers):
+        rows.append({
+            'Layer': i + 1,
+            **{field: float(layer[field]) for field in LAYER_FIELDS},
+            'Expected Payout': float(likelihood @ payouts[i]),
+            'Total Payout': float(payouts[i].sum()),
+            'Attachment Rate': float((financial > layer['Attachment ($)']).mean()) if len(financial) else 0.0,
+            'Aggregate Exhausted': bool(np.asarray(used[i]).sum() >= layer['Aggregate Limit ($)']),
+        })
+    return pd.DataFrame(rows)
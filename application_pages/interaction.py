@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager
+import pandas as pd
+import numpy as np
+import streamlit as st
+
+# Latencies kept per section for the sidebar summary
+MAX_TIMINGS_PER_SECTION = 50
+
+
+def get_version(name):
+    """Version counter of a piece of session state that other sections depend on (e.g. 'simulation_log')."""
+    return st.session_state.get(f'{name}_version', 0)
+
+
+def mark_changed(name, rerun=True):
+    """
+    Bumps the version of `name` so views caching on it refresh. With `rerun`, the whole app is rerun so
+    sections outside the calling fragment redraw with the change; without it only the current run sees it.
+    """
+    st.session_state[f'{name}_version'] = get_version(name) + 1
+    if rerun:
+        st.rerun(scope='app')
+
+
+@contextmanager
+def timed_interaction(section):
+    """Records the wall-clock time of the enclosed block, in milliseconds, under `section`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        history = st.session_state.setdefault('interaction_timings', {}).setdefault(section, [])
+        history.append((time.perf_counter() - start) * 1000)
+        del history[:-MAX_TIMINGS_PER_SECTION]
+
+
+def last_latency(section):
+    """Most recent recorded latency of `section` in milliseconds, or None."""
+    history = st.session_state.get('interaction_timings', {}).get(section)
+    return history[-1] if history else None
+
+
+def render_interaction_timings():
+    """Sidebar summary of the recorded per-section latencies."""
+    timings = st.session_state.get('interaction_timings', {})
+    with st.sidebar.expander("Interaction Latency"):
+        if not timings:
+            st.caption("No interactions timed yet.")
+            return
+        st.dataframe(pd.DataFrame([
+            {'Section': section, 'Last (ms)': history[-1], 'Median (ms)': float(np.median(history)), 'Runs': len(history)}
+            for section, history in timings.items()
+        ]).set_index('Section').round(1))
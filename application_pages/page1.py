@@ -1,23 +1,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-
-# Initialize session state variables if they don't exist
-if 'synthetic_data' not in st.session_state:
-    st.session_state['synthetic_data'] = pd.DataFrame()
-if 'risk_appetite_thresholds' not in st.session_state:
-    st.session_state['risk_appetite_thresholds'] = {
-        'Max Acceptable Financial Loss per Incident': 0.0,
-        'Max Acceptable Incidents per Period': 0,
-        'Max Acceptable Reputational Impact Score': 0.0
-    }
-if 'simulation_log' not in st.session_state:
-    st.session_state['simulation_log'] = pd.DataFrame(columns=[
-        'Scenario ID', 'Risk Category', 'Chosen Action',
-        'Initial Likelihood', 'Initial Financial Impact', 'Initial Reputational Impact', 'Initial Operational Impact',
-        'Residual Likelihood', 'Residual Financial Impact', 'Residual Reputational Impact', 'Residual Operational Impact',
-        'Financial Compliance', 'Operational Compliance', 'Reputational Compliance'
-    ])
+import json
+from application_pages.table_view import render_paginated_table
+from application_pages.rule_engine import compile_rules
+from application_pages.empirical_sampler import EMPIRICAL_COLUMNS, fit_empirical_model, generate_from_history
+from application_pages.scenario_dimensions import draw_drill_down_dimensions
+from application_pages.interaction import get_version, mark_changed, timed_interaction, last_latency
 
 def generate_synthetic_data(num_scenarios, seed=None):
     """Generates a DataFrame with synthetic risk scenario data."""
@@ -35,9 +24,26 @@ def generate_synthetic_data(num_scenarios, seed=None):
         'Initial Impact (Operational)': np.random.rand(num_scenarios) * 100
     }
 
+    # Drill-down dimensions are drawn after the original columns so seeded data stays reproducible
+    data.update(draw_drill_down_dimensions(data['Risk Category']))
+
     df = pd.DataFrame(data)
     return df
 
+EXAMPLE_RISK_APPETITE_RULES = [
+    {"name": "Strategic Loss Limit", "category": "Strategic",
+     "column": "Residual Financial Impact", "op": "<=", "value": 25000},
+    {"name": "Financial Category Total Loss", "category": "Financial", "aggregate": "sum",
+     "by": "Risk Category", "column": "Residual Financial Impact", "op": "<=", "value": 500000},
+    {"name": "Accepted Risks Stay Small", "any": [
+        {"column": "Chosen Action", "op": "!=", "value": "Accept"},
+        {"all": [
+            {"column": "Residual Financial Impact", "op": "<=", "value": 10000},
+            {"column": "Residual Reputational Impact", "op": "<=", "value": 3}
+        ]}
+    ]}
+]
+
 def set_risk_appetite_st(max_financial_loss, max_incidents, max_reputational_impact):
     """Stores the risk appetite thresholds in a dictionary."""
     return {
@@ -46,6 +52,50 @@ def set_risk_appetite_st(max_financial_loss, max_incidents, max_reputational_imp
         'Max Acceptable Reputational Impact Score': float(max_reputational_impact)
     }
 
+@st.fragment
+def render_synthetic_data_table():
+    """Paginated synthetic data; paging, sorting and filtering rerun only this fragment."""
+    if not st.session_state['synthetic_data'].empty:
+        render_paginated_table(
+            st.session_state['synthetic_data'], key='synthetic_data', version=get_version('synthetic_data'),
+            filter_columns=['Risk Category', 'Business Unit', 'Sub-Category', 'Period']
+        )
+    else:
+        st.info("Generate synthetic data using the controls above.")
+
+@st.fragment
+def render_risk_appetite_inputs():
+    """Threshold inputs and their summary; editing a threshold reruns only this fragment."""
+    with timed_interaction('Risk appetite inputs'):
+        max_financial_loss = st.number_input(
+            "Max Acceptable Financial Loss per Incident ($)",
+            min_value=0.0, value=50000.0, step=1000.0,
+            help="The maximum financial loss per incident the firm is willing to tolerate."
+        )
+        max_incidents = st.number_input(
+            "Max Acceptable Incidents per Period",
+            min_value=0, value=10, step=1,
+            help="Sets a cap on operational events per period, enforcing operational discipline."
+        )
+        max_reputational_impact = st.number_input(
+            "Max Acceptable Reputational Impact Score",
+            min_value=0.0, max_value=10.0, value=5.0, step=0.1,
+            help="Limits damage to the firm's public standing (score out of 10)."
+        )
+
+        # Rewrite the thresholds (and bump their version) only when a value actually changes
+        thresholds = set_risk_appetite_st(max_financial_loss, max_incidents, max_reputational_impact)
+        if thresholds != st.session_state['risk_appetite_thresholds']:
+            st.session_state['risk_appetite_thresholds'] = thresholds
+            mark_changed('risk_appetite_thresholds', rerun=False)
+
+        st.subheader("Current Risk Appetite Thresholds")
+        st.write(f"**Max Financial Loss:** ${st.session_state['risk_appetite_thresholds']['Max Acceptable Financial Loss per Incident']:,}")
+        st.write(f"**Max Incidents:** {st.session_state['risk_appetite_thresholds']['Max Acceptable Incidents per Period']}")
+        st.write(f"**Max Reputational Impact:** {st.session_state['risk_appetite_thresholds']['Max Acceptable Reputational Impact Score']:.1f}")
+
+    st.caption(f"Thresholds updated in {last_latency('Risk appetite inputs'):.1f} ms")
+
 def run_page1():
     st.header("Step 1: Generate Synthetic Risk Data")
     st.markdown(r"""
@@ -73,15 +123,37 @@ def run_page1():
         try:
             seed = int(seed_input) if seed_input else None
             st.session_state['synthetic_data'] = generate_synthetic_data(num_scenarios, seed=seed)
+            mark_changed('synthetic_data', rerun=False)
             st.success(f"Generated {num_scenarios} synthetic risk scenarios.")
         except ValueError:
             st.error("Please enter a valid integer for the random seed.")
 
+    with st.expander("Generate from Historical Loss Data"):
+        st.markdown(f"""
+        Upload a CSV of historical scenarios with a `Risk Category` column and {', '.join(f'`{c}`' for c in EMPIRICAL_COLUMNS)}
+        (`Business Unit`, `Sub-Category` and `Period` are optional). Scenarios are then drawn from the empirical
+        distribution of each risk category instead of the uniform formulae above, using precomputed lookup tables
+        so even millions of scenarios generate in seconds.
+        """)
+        history_file = st.file_uploader("Historical Loss Data (CSV)", type='csv')
+        num_history_scenarios = st.number_input(
+            "Number of Scenarios to Generate", min_value=1, max_value=50_000_000, value=10_000, step=1000
+        )
+        if st.button("Generate from History"):
+            if history_file is None:
+                st.error("Please upload a CSV of historical loss data first.")
+            else:
+                try:
+                    seed = int(seed_input) if seed_input else None
+                    model = fit_empirical_model(pd.read_csv(history_file))
+                    st.session_state['synthetic_data'] = generate_from_history(model, int(num_history_scenarios), seed=seed)
+                    mark_changed('synthetic_data', rerun=False)
+                    st.success(f"Generated {int(num_history_scenarios):,} scenarios from the historical loss data.")
+                except (KeyError, ValueError, pd.errors.ParserError) as e:
+                    st.error(f"Could not generate scenarios from the history: {e}")
+
     st.subheader("Synthetic Risk Scenarios")
-    if not st.session_state['synthetic_data'].empty:
-        st.dataframe(st.session_state['synthetic_data'])
-    else:
-        st.info("Generate synthetic data using the controls above.")
+    render_synthetic_data_table()
 
     st.divider()
 
@@ -92,28 +164,26 @@ def run_page1():
     supporting transparency and accountability.
     """)
 
-    max_financial_loss = st.number_input(
-        "Max Acceptable Financial Loss per Incident ($)",
-        min_value=0.0, value=50000.0, step=1000.0,
-        help="The maximum financial loss per incident the firm is willing to tolerate."
-    )
-    max_incidents = st.number_input(
-        "Max Acceptable Incidents per Period",
-        min_value=0, value=10, step=1,
-        help="Sets a cap on operational events per period, enforcing operational discipline."
-    )
-    max_reputational_impact = st.number_input(
-        "Max Acceptable Reputational Impact Score",
-        min_value=0.0, max_value=10.0, value=5.0, step=0.1,
-        help="Limits damage to the firm's public standing (score out of 10)."
-    )
+    render_risk_appetite_inputs()
 
-    # Update risk appetite thresholds immediately as inputs change
-    st.session_state['risk_appetite_thresholds'] = set_risk_appetite_st(
-        max_financial_loss, max_incidents, max_reputational_impact
+    st.subheader("Rule-Based Risk Appetite (Advanced)")
+    st.markdown("""
+    Beyond the flat thresholds above, risk appetite can be expressed as rules: limits scoped to a single
+    risk category, aggregate limits (e.g. total residual loss per category) and `all`/`any` composites.
+    Rules are compiled once and evaluated over the whole simulation log on the Impact Analysis page.
+    """)
+    rules_text = st.text_area(
+        "Risk Appetite Rules (JSON)",
+        json.dumps(st.session_state['risk_appetite_rules'] or EXAMPLE_RISK_APPETITE_RULES, indent=2),
+        height=300,
+        help="A JSON list of rules. Each rule needs a name and either column/op/value, an aggregate, or all/any."
     )
-
-    st.subheader("Current Risk Appetite Thresholds")
-    st.write(f"**Max Financial Loss:** ${st.session_state['risk_appetite_thresholds']['Max Acceptable Financial Loss per Incident']:,}")
-    st.write(f"**Max Incidents:** {st.session_state['risk_appetite_thresholds']['Max Acceptable Incidents per Period']}")
-    st.write(f"**Max Reputational Impact:** {st.session_state['risk_appetite_thresholds']['Max Acceptable Reputational Impact Score']:.1f}")
\ No newline at end of file
+    if st.button("Apply Rules"):
+        try:
+            rules = json.loads(rules_text)
+            compile_rules(rules)  # Validate before storing
+            st.session_state['risk_appetite_rules'] = rules
+            mark_changed('risk_appetite_rules', rerun=False)
+            st.success(f"Applied {len(rules)} risk appetite rules.")
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            st.error(f"Invalid rule set: {e}")
@@ -1,23 +1,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-
-# Re-initialize session state variables if they don't exist (for direct page access/refresh)
-if 'synthetic_data' not in st.session_state:
-    st.session_state['synthetic_data'] = pd.DataFrame()
-if 'risk_appetite_thresholds' not in st.session_state:
-    st.session_state['risk_appetite_thresholds'] = {
-        'Max Acceptable Financial Loss per Incident': 0.0,
-        'Max Acceptable Incidents per Period': 0,
-        'Max Acceptable Reputational Impact Score': 0.0
-    }
-if 'simulation_log' not in st.session_state:
-    st.session_state['simulation_log'] = pd.DataFrame(columns=[
-        'Scenario ID', 'Risk Category', 'Chosen Action',
-        'Initial Likelihood', 'Initial Financial Impact', 'Initial Reputational Impact', 'Initial Operational Impact',
-        'Residual Likelihood', 'Residual Financial Impact', 'Residual Reputational Impact', 'Residual Operational Impact',
-        'Financial Compliance', 'Operational Compliance', 'Reputational Compliance'
-    ])
+from application_pages.table_view import render_paginated_table
+from application_pages.simulation_engine import simulate_outcomes
+from application_pages.policy_runs import create_policy_store, save_policy_run, compare_policy_runs
+from application_pages.insurance_tower import EXAMPLE_TOWER, apply_tower, price_tower, tower_from_params
+from application_pages.interaction import get_version, mark_changed, timed_interaction, last_latency
 
 def simulate_scenario_outcome(scenario_data, action, action_params, risk_appetite_thresholds):
     """
@@ -47,11 +35,10 @@ def simulate_scenario_outcome(scenario_data, action, action_params, risk_appetit
         residual_operational_impact = initial_operational_impact * (1 - mitigation_impact_reduction)
 
     elif action == 'Transfer':
-        insurance_deductible = action_params.get('Insurance Deductible ($)', 0.0)
-        insurance_coverage_ratio = action_params.get('Insurance Coverage Ratio (%)', 0.0)
-
-        covered_amount = initial_financial_impact * insurance_coverage_ratio
-        residual_financial_impact = max(0.0, initial_financial_impact - covered_amount - insurance_deductible) # Deductible applied after coverage
+        # Deductible and coverage ratio act as a single layer attaching at the deductible, unless a tower is given.
+        # A single scenario is scored on its own, so aggregate limits only cap this scenario's payout; usage across
+        # scenarios is accumulated by the batch paths (Run on All Scenarios, tower pricing and stress tests)
+        residual_financial_impact = float(apply_tower(initial_financial_impact, tower_from_params(action_params))[0])
 
     elif action == 'Eliminate':
         residual_likelihood = 0.0
@@ -70,6 +57,9 @@ def simulate_scenario_outcome(scenario_data, action, action_params, risk_appetit
     result = {
         'Scenario ID': scenario_data['Scenario ID'],
         'Risk Category': scenario_data['Risk Category'],
+        'Business Unit': scenario_data.get('Business Unit', 'Unassigned'),
+        'Sub-Category': scenario_data.get('Sub-Category', 'Unassigned'),
+        'Period': scenario_data.get('Period', 'Unassigned'),
         'Chosen Action': action,
         'Initial Likelihood': initial_likelihood,
         'Initial Financial Impact': initial_financial_impact,
@@ -99,7 +89,7 @@ def update_simulation_log_st(simulation_log_df, scenario_outcome):
 
     # Ensure all expected columns are present to avoid future issues with concat
     expected_cols = [
-        'Scenario ID', 'Risk Category', 'Chosen Action',
+        'Scenario ID', 'Risk Category', 'Business Unit', 'Sub-Category', 'Period', 'Chosen Action',
         'Initial Likelihood', 'Initial Financial Impact', 'Initial Reputational Impact', 'Initial Operational Impact',
         'Residual Likelihood', 'Residual Financial Impact', 'Residual Reputational Impact', 'Residual Operational Impact',
         'Financial Compliance', 'Operational Compliance', 'Reputational Compliance'
@@ -124,35 +114,100 @@ def update_simulation_log_st(simulation_log_df, scenario_outcome):
     
     return pd.concat([simulation_log_df, new_row_df], ignore_index=True)
 
+def get_policy_store():
+    """
+    Returns the policy run store for the current synthetic data, creating a fresh one
+    whenever the scenario universe has been regenerated.
+    """
+    universe_version = get_version('synthetic_data')
+    store = st.session_state.get('policy_runs')
+    if store is None or store.get('universe_version') != universe_version:
+        store = create_policy_store(st.session_state['synthetic_data'])
+        store['universe_version'] = universe_version
+        st.session_state['policy_runs'] = store
+    return store
 
-def run_page2():
-    st.header("Step 3: Simulating Scenario Outcomes Based on Risk Management Actions")
-    st.markdown(r"""
-    This step models the impact of various risk management actions on the likelihood and impact of risk events,
-    allowing users to observe the effect of their decisions. Compliance is evaluated by verifying that the
-    residual impacts are within the predefined risk appetite.
 
-    **Formulae for actions:**
-    *   **Mitigate:**
-        *   Residual Likelihood = Initial Likelihood $ \times $ (1 - Mitigation Factor (Likelihood Reduction %))
-        *   Residual Impact = Initial Impact $ \times $ (1 - Mitigation Factor (Impact Reduction %))
-    *   **Transfer:**
-        *   Covered Amount = Initial Financial Impact $ \times $ Insurance Coverage Ratio (%)
-        *   Residual Financial Impact = max(0, Initial Financial Impact - Covered Amount) - Insurance Deductible
-    *   **Eliminate:**
-        *   Residual Likelihood = 0
-        *   Residual Impact = 0
-    """)
+# Above this many scenarios the scenario picker is an ID input, since a selectbox resends every option on each rerun
+MAX_SCENARIO_OPTIONS = 10_000
 
-    if not st.session_state['synthetic_data'].empty:
-        scenario_ids = st.session_state['synthetic_data']['Scenario ID'].tolist()
+
+def get_scenario_lookup():
+    """
+    Returns the sorted Scenario IDs with their row positions for the current synthetic data, plus the picker options
+    for small universes, rebuilt only when the scenario universe changes. The stable sort keeps the first row of
+    duplicate IDs first, so it is the one `find_scenario_position` returns.
+    """
+    universe_version = get_version('synthetic_data')
+    lookup = st.session_state.get('_scenario_lookup')
+    if lookup is None or lookup['universe_version'] != universe_version:
+        scenario_ids = st.session_state['synthetic_data']['Scenario ID'].to_numpy()
+        order = np.argsort(scenario_ids, kind='stable')
+        lookup = {
+            'universe_version': universe_version,
+            'sorted_ids': scenario_ids[order],
+            'order': order,
+            'options': scenario_ids.tolist() if len(scenario_ids) <= MAX_SCENARIO_OPTIONS else None,
+        }
+        st.session_state['_scenario_lookup'] = lookup
+    return lookup
+
+
+def find_scenario_position(lookup, scenario_id):
+    """Row position of the first scenario with `scenario_id`, or None if there is none."""
+    index = int(np.searchsorted(lookup['sorted_ids'], scenario_id))
+    if index < len(lookup['sorted_ids']) and lookup['sorted_ids'][index] == scenario_id:
+        return int(lookup['order'][index])
+    return None
+
+
+def select_scenario():
+    """Scenario picker: a selectbox for small universes, an ID input validated against the lookup otherwise."""
+    lookup = get_scenario_lookup()
+    if lookup['options'] is not None:
         selected_scenario_id = st.selectbox(
-            "Select Scenario to Simulate", scenario_ids,
+            "Select Scenario to Simulate", lookup['options'],
             help="Choose a scenario to apply a risk management action."
         )
-        selected_scenario = st.session_state['synthetic_data'][
-            st.session_state['synthetic_data']['Scenario ID'] == selected_scenario_id
-        ].iloc[0]
+    else:
+        selected_scenario_id = st.number_input(
+            "Select Scenario to Simulate", value=st.session_state['synthetic_data']['Scenario ID'].iloc[0].item(),
+            step=1, help="Enter the Scenario ID to apply a risk management action to."
+        )
+    position = None if selected_scenario_id is None else find_scenario_position(lookup, selected_scenario_id)
+    if position is None:
+        if selected_scenario_id is not None:
+            st.warning(f"Scenario ID {selected_scenario_id} does not exist.")
+        return None, None
+    return selected_scenario_id, st.session_state['synthetic_data'].iloc[position]
+
+
+def record_simulated_outcome(outcome):
+    """Adds `outcome` to the simulation log, replacing the existing entry for its Scenario ID."""
+    current_scenario_id = outcome['Scenario ID']
+    simulation_log = st.session_state['simulation_log']
+    if simulation_log.empty or current_scenario_id not in simulation_log.get('Scenario ID', pd.Series()).values:
+        st.session_state['simulation_log'] = update_simulation_log_st(simulation_log, outcome)
+    else:
+        idx_to_update = simulation_log[simulation_log['Scenario ID'] == current_scenario_id].index[0]
+        simulation_log.loc[idx_to_update] = outcome
+
+
+@st.fragment
+def render_outcome_panel():
+    """
+    Scenario, action and parameter controls with their outcome. Runs as a fragment so parameter tweaks only
+    redraw this panel; the whole page reruns only when the simulation log or the policy runs change.
+    """
+    with timed_interaction('Outcome panel'):
+        notice = st.session_state.pop('_outcome_notice', None)
+        if notice is not None:
+            for message in notice['messages']:
+                st.success(message)
+            if notice.get('outcome') is not None:
+                st.dataframe(pd.DataFrame([notice['outcome']]).set_index('Scenario ID')) # Display the single outcome
+
+        selected_scenario_id, selected_scenario = select_scenario()
 
         action_options = ['Accept', 'Mitigate', 'Transfer', 'Eliminate']
         selected_action = st.selectbox(
@@ -177,17 +232,130 @@ def run_page2():
             )
             action_params['Insurance Coverage Ratio (%)'] = st.slider(
                 "Insurance Coverage Ratio (%)", 0.0, 1.0, 0.8, 0.05,
-                help="Proportion of financial loss covered by insurance."
+                help="Proportion of financial loss above the deductible covered by insurance."
             )
+            if st.checkbox("Use Layered Insurance Tower", help="Replace the deductible and coverage ratio with a tower of layers."):
+                st.markdown("""
+                Each layer pays its share of the loss above its attachment, up to its per-scenario limit; an aggregate
+                limit caps the layer's total payouts across scenarios. Leave a limit empty for no limit.
 
-        if st.button("Run Simulation"):
-            outcome = simulate_scenario_outcome(
-                selected_scenario, selected_action, action_params, st.session_state['risk_appetite_thresholds']
+                **Note:** aggregate limits are only accumulated across scenarios by "Run on All Scenarios" and
+                "Price Tower Over All Scenarios". "Run Simulation" scores one scenario on its own, so there an
+                aggregate limit only caps that scenario's payout and ignores payouts already in the simulation log.
+                """)
+                tower = st.data_editor(EXAMPLE_TOWER, num_rows='dynamic', key='insurance_tower', use_container_width=True)
+                action_params = {'Insurance Tower': tower.dropna(how='all').to_dict(orient='records')}
+                if st.button("Price Tower Over All Scenarios"):
+                    try:
+                        st.dataframe(price_tower(st.session_state['synthetic_data'], action_params['Insurance Tower']))
+                    except ValueError as e:
+                        st.error(f"Invalid insurance tower: {e}")
+
+        if st.button("Run Simulation", disabled=selected_scenario is None):
+            try:
+                outcome = simulate_scenario_outcome(
+                    selected_scenario, selected_action, action_params, st.session_state['risk_appetite_thresholds']
+                )
+            except ValueError as e:
+                st.error(f"Could not run the simulation: {e}")
+            else:
+                record_simulated_outcome(outcome)
+                st.session_state['_outcome_notice'] = {'outcome': outcome, 'messages': [
+                    f"Simulation run for Scenario ID: {selected_scenario_id} with action: {selected_action}",
+                    f"Scenario ID {selected_scenario_id} added/updated in simulation log."
+                ]}
+                mark_changed('simulation_log')
+
+        st.markdown("Apply the chosen action to **every** scenario and store the result as a named policy run for what-if comparison.")
+        batch_run_name = st.text_input(
+            "Policy Run Name", f"All {selected_action}",
+            help="Runs with the same name are replaced."
+        )
+        if st.button("Run on All Scenarios"):
+            try:
+                outcomes = simulate_outcomes(
+                    st.session_state['synthetic_data'], selected_action, action_params,
+                    st.session_state['risk_appetite_thresholds']
+                )
+            except ValueError as e:
+                st.error(f"Could not run the simulation: {e}")
+            else:
+                save_policy_run(get_policy_store(), batch_run_name, outcomes)
+                st.session_state['_outcome_notice'] = {'messages': [
+                    f"Saved policy run '{batch_run_name}' covering {len(outcomes):,} scenarios."
+                ]}
+                mark_changed('policy_runs')
+
+    st.caption(f"Panel updated in {last_latency('Outcome panel'):.1f} ms")
+
+
+@st.fragment
+def render_simulation_log():
+    """Paginated simulation log; paging, sorting and filtering rerun only this fragment."""
+    with timed_interaction('Simulation log'):
+        if not st.session_state['simulation_log'].empty:
+            render_paginated_table(
+                st.session_state['simulation_log'], key='simulation_log', version=get_version('simulation_log'),
+                filter_columns=['Risk Category', 'Business Unit', 'Period', 'Chosen Action',
+                                'Financial Compliance', 'Operational Compliance', 'Reputational Compliance']
             )
-            st.session_state['last_simulated_outcome'] = outcome
-            st.success(f"Simulation run for Scenario ID: {selected_scenario_id} with action: {selected_action}")
-            st.dataframe(pd.DataFrame([outcome]).set_index('Scenario ID')) # Display the single outcome
+        else:
+            st.info("Run simulations to see the log here.")
+
+
+@st.fragment
+def render_policy_comparison():
+    """Saves the log as a policy run and compares selected runs."""
+    with timed_interaction('Policy comparison'):
+        store = get_policy_store()
+        log_run_name = st.text_input("Name for Current Log", "Simulation Log", help="Save the simulation log as a policy run.")
+        if st.button("Save Log as Policy Run"):
+            try:
+                save_policy_run(store, log_run_name, st.session_state['simulation_log'])
+                st.success(f"Saved policy run '{log_run_name}'.")
+            except (KeyError, ValueError) as e:
+                st.error(f"Could not save policy run: {e}")
 
+        selected_runs = st.multiselect(
+            "Policy Runs to Compare", list(store['runs']),
+            help="The first selected run is the baseline the others are compared against."
+        )
+        if len(selected_runs) >= 2:
+            comparison = compare_policy_runs(store, selected_runs)
+            st.subheader(f"Residual Financial Impact vs. '{comparison['baseline']}'")
+            st.dataframe(comparison['deltas'])
+            st.subheader("Compliance Flips")
+            st.dataframe(comparison['compliance_flips'])
+            st.subheader("Residual Financial Impact by Risk Category")
+            st.dataframe(comparison['category_totals'])
+        else:
+            st.info("Save at least two policy runs and select them to compare.")
+
+
+def run_page2():
+    st.header("Step 3: Simulating Scenario Outcomes Based on Risk Management Actions")
+    st.markdown(r"""
+    This step models the impact of various risk management actions on the likelihood and impact of risk events,
+    allowing users to observe the effect of their decisions. Compliance is evaluated by verifying that the
+    residual impacts are within the predefined risk appetite.
+
+    **Formulae for actions:**
+    *   **Mitigate:**
+        *   Residual Likelihood = Initial Likelihood $ \times $ (1 - Mitigation Factor (Likelihood Reduction %))
+        *   Residual Impact = Initial Impact $ \times $ (1 - Mitigation Factor (Impact Reduction %))
+    *   **Transfer:**
+        *   Covered Amount = Insurance Coverage Ratio (%) $ \times $ max(0, Initial Financial Impact - Insurance Deductible)
+        *   Residual Financial Impact = Initial Financial Impact - Covered Amount
+        *   With a layered tower, each layer pays Share $ \times $ min(max(0, Loss - Attachment), Limit),
+            capped by its aggregate limit across scenarios (accumulated only when running on all scenarios or
+            pricing the tower; a single simulation applies the aggregate limit to that scenario alone)
+    *   **Eliminate:**
+        *   Residual Likelihood = 0
+        *   Residual Impact = 0
+    """)
+
+    if not st.session_state['synthetic_data'].empty:
+        render_outcome_panel()
     else:
         st.warning("Please generate synthetic data on the 'Data Generation & Risk Appetite' page first to simulate scenarios.")
         st.info("Simulated Scenario Outcome will appear here after running a simulation.")
@@ -201,26 +369,20 @@ def run_page2():
     tracking and reviewing risk-response effectiveness over time.
     """)
 
-    if 'last_simulated_outcome' in st.session_state and st.session_state['last_simulated_outcome']:
-        # Check if the scenario ID already exists in the log to prevent duplicates if user clicks multiple times
-        current_scenario_id = st.session_state['last_simulated_outcome']['Scenario ID']
-        simulation_log = st.session_state['simulation_log']
-        if simulation_log.empty or current_scenario_id not in simulation_log.get('Scenario ID', pd.Series()).values:
-            st.session_state['simulation_log'] = update_simulation_log_st(
-                st.session_state['simulation_log'], st.session_state.pop('last_simulated_outcome')
-            )
-        else:
-            # If scenario ID exists, update the existing entry
-            idx_to_update = st.session_state['simulation_log'][st.session_state['simulation_log']['Scenario ID'] == current_scenario_id].index[0]
-            st.session_state['simulation_log'].loc[idx_to_update] = st.session_state.pop('last_simulated_outcome')
-        st.success(f"Scenario ID {current_scenario_id} added/updated in simulation log.")
-    # Ensure last_simulated_outcome is cleared even if not added to log to prevent re-adding on refresh
-    if 'last_simulated_outcome' in st.session_state:
-        del st.session_state['last_simulated_outcome']
+    st.subheader("Simulation Log")
+    render_simulation_log()
 
+    st.divider()
 
-    st.subheader("Simulation Log")
-    if not st.session_state['simulation_log'].empty:
-        st.dataframe(st.session_state['simulation_log'])
-    else:
-        st.info("Run simulations to see the log here.")
\ No newline at end of file
+    st.header("Step 4b: Comparing Policy Runs")
+    st.markdown("""
+    Named policy runs capture the residual outcomes of a policy across the scenario universe, aligned by Scenario ID.
+    Comparing runs shows how switching policy changes residual losses, which scenarios flip in or out of appetite,
+    and where the difference is concentrated by risk category.
+    """)
+
+    if st.session_state['synthetic_data'].empty:
+        st.info("Generate synthetic data to store and compare policy runs.")
+        return
+
+    render_policy_comparison()
@@ -1,23 +1,17 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-
-# Re-initialize session state variables if they don't exist (for direct page access/refresh)
-if 'synthetic_data' not in st.session_state:
-    st.session_state['synthetic_data'] = pd.DataFrame()
-if 'risk_appetite_thresholds' not in st.session_state:
-    st.session_state['risk_appetite_thresholds'] = {
-        'Max Acceptable Financial Loss per Incident': 0.0,
-        'Max Acceptable Incidents per Period': 0,
-        'Max Acceptable Reputational Impact Score': 0.0
-    }
-if 'simulation_log' not in st.session_state:
-    st.session_state['simulation_log'] = pd.DataFrame(columns=[
-        'Scenario ID', 'Risk Category', 'Chosen Action',
-        'Initial Likelihood', 'Initial Financial Impact', 'Initial Reputational Impact', 'Initial Operational Impact',
-        'Residual Likelihood', 'Residual Financial Impact', 'Residual Reputational Impact', 'Residual Operational Impact',
-        'Financial Compliance', 'Operational Compliance', 'Reputational Compliance'
-    ])
+import json
+from application_pages.rule_engine import compile_rules, default_rules, summarize_rule_results
+from application_pages.tail_estimation import (
+    estimate_breach_probability, estimate_tail_risk, lognormal_tail_probability, lognormal_quantile
+)
+from application_pages.convergence import simulate_until_converged
+from application_pages.bootstrap import bootstrap_aggregate_results
+from application_pages.aggregation_cube import CUBE_DIMENSIONS, build_aggregation_cube, query_cube, dimension_values
+from application_pages.simulation_engine import ACTIONS
+from application_pages.stress_testing import DEFAULT_STRESS_SCENARIOS, run_stress_test
+from application_pages.interaction import get_version
 
 def calculate_cumulative_impact(simulation_log):
     """
@@ -76,6 +70,319 @@ def aggregate_results(simulation_log):
         st.error(f"An error occurred during aggregation: {e}")
         return pd.DataFrame()
 
+def get_compiled_rules(rules):
+    """Compiles `rules`, re-using the compiled evaluator while the rule set is unchanged."""
+    rules_key = json.dumps(rules, sort_keys=True, default=str)
+    cached = st.session_state.get('compiled_risk_appetite_rules')
+    if cached is None or cached[0] != rules_key:
+        cached = (rules_key, compile_rules(rules))
+        st.session_state['compiled_risk_appetite_rules'] = cached
+    return cached[1]
+
+def get_rule_summary(rules):
+    """
+    Returns the breach summary of `rules` over the simulation log, re-evaluating it only after the log, the flat
+    thresholds or the advanced rules change.
+    """
+    summary_key = tuple(get_version(name) for name in ('simulation_log', 'risk_appetite_thresholds', 'risk_appetite_rules'))
+    cached = st.session_state.get('risk_appetite_rule_summary')
+    if cached is None or cached[0] != summary_key:
+        cached = (summary_key, summarize_rule_results(get_compiled_rules(rules)(st.session_state['simulation_log'])))
+        st.session_state['risk_appetite_rule_summary'] = cached
+    return cached[1]
+
+@st.fragment
+def render_rule_evaluation():
+    """Evaluates the flat thresholds and advanced rules over the whole simulation log."""
+    st.header("Step 7: Evaluating the Risk Appetite Rule Set")
+    st.markdown("""
+    The flat risk appetite thresholds and any advanced rules defined on the first page are compiled into one
+    rule set and evaluated over the entire simulation log in a single pass. Breach counts per rule highlight
+    which limits are binding.
+    """)
+
+    if st.session_state['simulation_log'].empty:
+        st.info("Run simulations and log outcomes to evaluate the risk appetite rules.")
+        return
+
+    thresholds = st.session_state['risk_appetite_thresholds']
+    rules = list(st.session_state.get('risk_appetite_rules', []))
+    if thresholds:
+        rules = default_rules(thresholds) + rules
+    if not rules:
+        st.info("Define risk appetite thresholds or rules on the first page to evaluate them.")
+        return
+
+    try:
+        st.dataframe(get_rule_summary(rules))
+    except (KeyError, TypeError, ValueError) as e:
+        st.error(f"Could not evaluate the risk appetite rules: {e}")
+
+@st.fragment
+def render_tail_risk_estimation():
+    """Compares importance sampling with plain Monte Carlo for rare breaches and tail losses."""
+    st.header("Step 8: Estimating Rare Breaches and Tail Losses")
+    st.markdown(r"""
+    This step works on a **model**, not on the generated scenarios: the heavy-tailed financial impact of the
+    `definitions` generator, $ X \sim \mathrm{Lognormal}(\mu=5, \sigma=2) $. (The scenarios generated on Page 1 draw
+    financial impact from $ \mathrm{Uniform}(0, 100000) $, which has no tail beyond $100,000.) Under this model,
+    breaches of the per-incident loss limit and 99.9% tail losses are rare and plain Monte Carlo needs enormous trial
+    counts to estimate them. Importance sampling draws $ \log X $ from a proposal shifted towards the tail,
+    $ \mathcal{N}(\mu + \theta, \sigma) $, and re-weights each draw by its likelihood ratio
+    $ w = \exp\left(-\theta(\log X - \mu)/\sigma^2 + \theta^2 / 2\sigma^2\right) $.
+    The exact values of the Lognormal(5, 2) model are shown as a reference.
+    """)
+
+    col_trials, col_confidence, col_seed = st.columns(3)
+    with col_trials:
+        num_trials = st.select_slider(
+            "Number of Trials", options=[1000, 10000, 100000, 1000000], value=10000,
+            help="Trials used by both estimators."
+        )
+    with col_confidence:
+        confidence = st.selectbox("Tail Confidence Level", [0.99, 0.995, 0.999], index=2)
+    with col_seed:
+        seed = st.number_input("Sampling Seed", min_value=0, value=42, step=1)
+
+    threshold = st.session_state['risk_appetite_thresholds'].get('Max Acceptable Financial Loss per Incident', 0.0)
+    if threshold <= 0:
+        st.info("Set a positive Max Acceptable Financial Loss per Incident to estimate breach probabilities.")
+        return
+
+    if st.button("Run Tail Estimation"):
+        rows = []
+        for method, shift in (('Importance Sampling', None), ('Plain Monte Carlo', 0.0)):
+            breach = estimate_breach_probability(threshold, int(num_trials), shift=shift, seed=int(seed))
+            tail = estimate_tail_risk(confidence, int(num_trials), shift=shift, seed=int(seed))
+            rows.append({
+                'Method': method,
+                'Breach Probability': breach['Estimate'],
+                'Breach Probability SE': breach['Standard Error'],
+                f'VaR {confidence:.1%}': tail['VaR'],
+                'VaR SE': tail['VaR Standard Error'],
+                f'ES {confidence:.1%}': tail['Expected Shortfall'],
+                'ES SE': tail['ES Standard Error'],
+                'Effective Sample Size': tail['Effective Sample Size'],
+                'Equivalent Plain Trials (Breach)': breach['Equivalent Plain Trials'],
+            })
+        rows.append({
+            'Method': 'Exact (Lognormal(5, 2) Model)',
+            'Breach Probability': lognormal_tail_probability(threshold),
+            f'VaR {confidence:.1%}': lognormal_quantile(confidence),
+        })
+        st.dataframe(pd.DataFrame(rows).set_index('Method'))
+        st.caption(
+            f"Breach threshold: ${threshold:,.0f} per incident. All values are for the Lognormal(5, 2) model of the "
+            "definitions generator, not for the Page 1 scenarios. Standard errors are asymptotic."
+        )
+
+@st.fragment
+def render_adaptive_portfolio_simulation():
+    """Simulates portfolio periods with each sampler until the requested precision is reached."""
+    st.header("Step 9: Simulating Portfolio Losses to a Target Precision")
+    st.markdown(r"""
+    Each simulated period draws which scenarios occur (with their initial likelihood) and adds up their financial
+    impact, optionally scaled by a random lognormal severity. Instead of a fixed trial count, the simulation keeps a
+    running (Welford) mean and variance and stops once the confidence interval is within the requested precision.
+    Antithetic pairs $ (u, 1-u) $ and scrambled Sobol' sequences cover the probability space more evenly than
+    independent draws, so they typically reach the same precision with far fewer trials.
+    """)
+
+    if st.session_state['synthetic_data'].empty:
+        st.info("Generate synthetic data to simulate portfolio losses.")
+        return
+
+    col_target, col_tol, col_severity = st.columns(3)
+    with col_target:
+        target = st.radio(
+            "Estimate", ['portfolio_loss', 'breach_rate'], horizontal=True,
+            format_func=lambda value: {'portfolio_loss': 'Expected Portfolio Loss', 'breach_rate': 'Incident Breach Rate'}[value],
+            help="The breach rate is the probability of more incidents per period than the risk appetite allows."
+        )
+    with col_tol:
+        if target == 'portfolio_loss':
+            rel_tol, abs_tol = st.slider("Relative Precision (%)", 0.1, 5.0, 1.0, 0.1) / 100, 0.0
+        else:
+            rel_tol, abs_tol = 0.0, st.slider("Absolute Precision", 0.001, 0.05, 0.01, 0.001, format="%.3f")
+    with col_severity:
+        severity_sigma = st.slider(
+            "Severity Volatility (σ)", 0.0, 1.0, 0.0, 0.1,
+            help="Lognormal volatility of each incident's loss around its financial impact; 0 keeps impacts fixed."
+        )
+
+    if st.button("Run Adaptive Simulation"):
+        synthetic_data = st.session_state['synthetic_data']
+        max_incidents = st.session_state['risk_appetite_thresholds'].get('Max Acceptable Incidents per Period', 0)
+        results = []
+        for sampler in ['pseudo', 'antithetic', 'sobol']:
+            try:
+                results.append(simulate_until_converged(
+                    synthetic_data['Initial Likelihood'].to_numpy(),
+                    synthetic_data['Initial Impact (Financial)'].to_numpy(),
+                    target=target, max_incidents=max_incidents, sampler=sampler,
+                    rel_tol=rel_tol, abs_tol=abs_tol, severity_sigma=severity_sigma,
+                    max_trials=200_000, seed=42
+                ))
+            except ValueError as e:
+                st.warning(f"Sampler '{sampler}' skipped: {e}")
+        st.dataframe(pd.DataFrame(results).set_index('Sampler'))
+
+def get_aggregation_cube():
+    """Returns the aggregation cube for the simulation log, rebuilding it only after the log changes."""
+    log_version = get_version('simulation_log')
+    cached = st.session_state.get('aggregation_cube')
+    if cached is None or cached[0] != log_version:
+        cached = (log_version, build_aggregation_cube(st.session_state['simulation_log']))
+        st.session_state['aggregation_cube'] = cached
+    return cached[1]
+
+@st.fragment
+def render_drill_down():
+    """Slices, dices and drills down the simulation log from the precomputed aggregation cube."""
+    st.header("Step 10: Drilling Down by Business Unit, Sub-Category and Period")
+    st.markdown("""
+    Every combination of risk category, action, business unit, sub-category and period is pre-aggregated into a
+    cube when the log changes, so breaking results down, filtering them and drilling further are answered from the
+    cube instantly instead of rescanning the log.
+    """)
+
+    if st.session_state['simulation_log'].empty:
+        st.info("Run simulations and log outcomes to drill down into the results.")
+        return
+
+    cube = get_aggregation_cube()
+    group_by = st.multiselect(
+        "Break Down By (drill-down order)", CUBE_DIMENSIONS, default=['Risk Category'],
+        help="Add dimensions to drill down; remove them to roll up."
+    )
+    filter_cols = st.columns(len(CUBE_DIMENSIONS))
+    filters = {}
+    for col, dimension in zip(filter_cols, CUBE_DIMENSIONS):
+        with col:
+            filters[dimension] = st.multiselect(f"Slice: {dimension}", dimension_values(cube, dimension))
+    measure = st.selectbox("Measure", cube['measures'], index=cube['measures'].index('Residual Financial Impact'))
+
+    result = query_cube(cube, group_by, filters)
+    st.dataframe(result)
+    if group_by and not result.empty:
+        fig_drill = px.bar(
+            result, x=group_by[0], y=measure, color=group_by[1] if len(group_by) > 1 else None,
+            barmode='group', title=f"{measure} by {' / '.join(group_by)}"
+        )
+        st.plotly_chart(fig_drill, use_container_width=True)
+
+@st.fragment
+def render_stress_testing():
+    """Applies a table of stress scenarios to the whole scenario universe under one action."""
+    st.header("Step 11: Stress Testing the Risk Appetite")
+    st.markdown("""
+    Each stress scenario scales likelihoods and impacts for one risk category (or 'All') and can shift insurance
+    coverage, e.g. in a hard insurance market. Rows with the same stress scenario name combine. All stress scenarios
+    are applied to every generated scenario in a single batched evaluation, reporting how often the risk appetite
+    would be breached and the resulting residual losses.
+    """)
+
+    if st.session_state['synthetic_data'].empty:
+        st.info("Generate synthetic data to run stress tests.")
+        return
+
+    stress_table = st.data_editor(
+        DEFAULT_STRESS_SCENARIOS, num_rows='dynamic', key='stress_scenarios', use_container_width=True
+    )
+
+    stress_action = st.selectbox("Action Under Stress", ACTIONS, key='stress_action')
+    action_params = {}
+    if stress_action == 'Mitigate':
+        action_params['Mitigation Factor (Impact Reduction %)'] = st.slider(
+            "Impact Reduction (%)", 0.0, 1.0, 0.5, 0.05, key='stress_impact_reduction'
+        )
+        action_params['Mitigation Factor (Likelihood Reduction %)'] = st.slider(
+            "Likelihood Reduction (%)", 0.0, 1.0, 0.5, 0.05, key='stress_likelihood_reduction'
+        )
+    elif stress_action == 'Transfer':
+        action_params['Insurance Deductible ($)'] = st.number_input(
+            "Insurance Deductible ($)", 0.0, 50000.0, 0.0, 100.0, key='stress_deductible'
+        )
+        action_params['Insurance Coverage Ratio (%)'] = st.slider(
+            "Insurance Coverage Ratio (%)", 0.0, 1.0, 0.8, 0.05, key='stress_coverage'
+        )
+
+    if st.button("Run Stress Test"):
+        try:
+            results = run_stress_test(
+                st.session_state['synthetic_data'], stress_table.dropna(subset=['Stress Scenario', 'Risk Category']),
+                stress_action, action_params, st.session_state['risk_appetite_thresholds']
+            )
+        except (KeyError, ValueError) as e:
+            st.error(f"Could not run the stress test: {e}")
+            return
+        st.dataframe(results)
+        fig_stress = px.bar(
+            results.melt(
+                id_vars='Stress Scenario',
+                value_vars=['Financial Breach Rate', 'Operational Breach Rate', 'Reputational Breach Rate', 'Any Breach Rate'],
+                var_name='Breach Type', value_name='Breach Rate'
+            ),
+            x='Stress Scenario', y='Breach Rate', color='Breach Type', barmode='group',
+            title=f'Risk Appetite Breach Rates Under Stress ({stress_action})'
+        )
+        st.plotly_chart(fig_stress, use_container_width=True)
+
+def get_bootstrap_results(num_resamples, confidence):
+    """
+    Returns the aggregated results with bootstrap intervals, re-running the bootstrap only after the simulation
+    log or the resampling settings change.
+    """
+    bootstrap_key = (get_version('simulation_log'), num_resamples, confidence)
+    cached = st.session_state.get('bootstrap_results')
+    if cached is None or cached[0] != bootstrap_key:
+        cached = (bootstrap_key, bootstrap_aggregate_results(
+            st.session_state['simulation_log'], num_resamples=num_resamples, confidence=confidence, seed=42
+        ))
+        st.session_state['bootstrap_results'] = cached
+    return cached[1]
+
+@st.fragment
+def render_aggregated_results():
+    """Aggregated residual losses with bootstrap intervals; changing the resampling settings reruns only this fragment."""
+    aggregated_df = aggregate_results(st.session_state['simulation_log'])
+
+    if not aggregated_df.empty:
+        st.markdown("""
+        Group totals are point estimates. Bootstrap confidence intervals resample the logged scenarios within each
+        group to show how much a total could move by chance, so small differences between groups are not over-read.
+        """)
+        col_resamples, col_confidence = st.columns(2)
+        with col_resamples:
+            num_resamples = st.select_slider("Bootstrap Resamples", options=[500, 1000, 5000, 10000], value=1000)
+        with col_confidence:
+            ci_level = st.selectbox("Confidence Level", [0.90, 0.95, 0.99], index=1, format_func=lambda level: f"{level:.0%}")
+        try:
+            aggregated_df = get_bootstrap_results(num_resamples, ci_level)
+        except (KeyError, ValueError) as e:
+            st.error(f"Could not compute bootstrap intervals: {e}")
+        st.dataframe(aggregated_df)
+
+        has_ci = 'CI Lower' in aggregated_df.columns
+        fig_agg = px.bar(
+            aggregated_df,
+            x='Risk Category',
+            y='Residual Financial Impact',
+            color='Chosen Action',
+            barmode='group',
+            error_y=aggregated_df['CI Upper'] - aggregated_df['Residual Financial Impact'] if has_ci else None,
+            error_y_minus=aggregated_df['Residual Financial Impact'] - aggregated_df['CI Lower'] if has_ci else None,
+            title='Aggregated Residual Financial Impact by Risk Category and Action',
+            labels={
+                'Risk Category': 'Risk Category',
+                'Residual Financial Impact': 'Total Residual Financial Impact ($)',
+                'Chosen Action': 'Action Taken'
+            }
+        )
+        st.plotly_chart(fig_agg, use_container_width=True)
+    else:
+        st.info("Run simulations and log outcomes to view aggregated results.")
+
 def run_page3():
     st.header("Step 5: Calculating Cumulative Impact Over Time")
     st.markdown(r"""
@@ -127,24 +434,19 @@ def run_page3():
     is most frequently breached. This targeted insight enables efficient resource allocation and focused policy adjustments.
     """)
 
-    aggregated_df = aggregate_results(st.session_state['simulation_log'])
+    render_aggregated_results()
 
-    if not aggregated_df.empty:
-        st.dataframe(aggregated_df)
+    st.divider()
+    render_rule_evaluation()
 
-        fig_agg = px.bar(
-            aggregated_df,
-            x='Risk Category',
-            y='Residual Financial Impact',
-            color='Chosen Action',
-            barmode='group',
-            title='Aggregated Residual Financial Impact by Risk Category and Action',
-            labels={
-                'Risk Category': 'Risk Category',
-                'Residual Financial Impact': 'Total Residual Financial Impact ($)',
-                'Chosen Action': 'Action Taken'
-            }
-        )
-        st.plotly_chart(fig_agg, use_container_width=True)
-    else:
-        st.info("Run simulations and log outcomes to view aggregated results.")
\ No newline at end of file
+    st.divider()
+    render_tail_risk_estimation()
+
+    st.divider()
+    render_adaptive_portfolio_simulation()
+
+    st.divider()
+    render_drill_down()
+
+    st.divider()
+    render_stress_testing()
@@ -0,0 +1,123 @@
+import pandas as pd
+import numpy as np
+
+RUN_VALUE_COLUMNS = [
+    'Residual Likelihood', 'Residual Financial Impact', 'Residual Reputational Impact', 'Residual Operational Impact'
+]
+RUN_COMPLIANCE_COLUMNS = ['Financial Compliance', 'Operational Compliance', 'Reputational Compliance']
+
+
+def create_policy_store(synthetic_data):
+    """
+    Creates an empty policy run store for the scenario universe in `synthetic_data`.
+    Every run saved into the store is kept as column arrays aligned to the sorted 'Scenario ID's,
+    so runs can be compared position by position.
+    """
+    order = np.argsort(synthetic_data['Scenario ID'].to_numpy(), kind='stable')
+    scenario_ids = synthetic_data['Scenario ID'].to_numpy()[order]
+    if len(scenario_ids) > 1 and (scenario_ids[1:] == scenario_ids[:-1]).any():
+        raise ValueError("Scenario IDs must be unique to build a policy run store.")
+    category_codes, categories = pd.factorize(synthetic_data['Risk Category'].to_numpy()[order], sort=True)
+    return {
+        'scenario_ids': scenario_ids,
+        'category_codes': category_codes,
+        'categories': list(categories),
+        'runs': {},
+    }
+
+
+def save_policy_run(store, name, outcomes):
+    """
+    Saves the simulated `outcomes` (simulation log rows) as the named policy run, replacing any run of that name.
+    Scenarios absent from `outcomes` are marked as not simulated.
+    """
+    if not name:
+        raise ValueError("A policy run needs a name.")
+    if outcomes.empty:
+        raise ValueError("Cannot save an empty policy run.")
+
+    outcome_ids = outcomes['Scenario ID'].to_numpy()
+    if len(store['scenario_ids']) == 0:
+        raise KeyError("The scenario universe is empty.")
+    positions = np.searchsorted(store['scenario_ids'], outcome_ids)
+    positions = np.minimum(positions, len(store['scenario_ids']) - 1)
+    if not (store['scenario_ids'][positions] == outcome_ids).all():
+        raise KeyError("Outcomes contain Scenario IDs that are not part of the scenario universe.")
+
+    num_scenarios = len(store['scenario_ids'])
+    simulated = np.zeros(num_scenarios, dtype=bool)
+    simulated[positions] = True
+    run = {'Simulated': simulated}
+    for column in RUN_VALUE_COLUMNS:
+        values = np.full(num_scenarios, np.nan)
+        values[positions] = pd.to_numeric(outcomes[column], errors='coerce').to_numpy(dtype=float)
+        run[column] = values
+    for column in RUN_COMPLIANCE_COLUMNS:
+        values = np.zeros(num_scenarios, dtype=bool)
+        values[positions] = outcomes[column].eq(True).to_numpy()
+        run[column] = values
+
+    store['runs'][name] = run
+    return store
+
+
+def compare_policy_runs(store, names):
+    """
+    Compares two or more policy runs against the first one in `names` (the baseline).
+    Only scenarios simulated in both runs contribute to deltas and compliance flips.
+    Returns a dictionary with a per-run delta summary, compliance flip counts and per-category totals.
+    """
+    if len(names) < 2:
+        raise ValueError("Select at least two policy runs to compare.")
+    missing = [name for name in names if name not in store['runs']]
+    if missing:
+        raise KeyError(f"Unknown policy runs: {missing}")
+
+    baseline = store['runs'][names[0]]
+    codes = store['category_codes']
+    num_categories = len(store['categories'])
+
+    delta_rows = []
+    flip_rows = []
+    for name in names[1:]:
+        run = store['runs'][name]
+        both = baseline['Simulated'] & run['Simulated']
+        delta = run['Residual Financial Impact'][both] - baseline['Residual Financial Impact'][both]
+        delta_rows.append({
+            'Policy Run': name,
+            'Scenarios Compared': int(both.sum()),
+            'Total Residual Financial Delta': float(delta.sum()),
+            'Mean Residual Financial Delta': float(delta.mean()) if delta.size else np.nan,
+            'Scenarios Improved': int((delta < 0).sum()),
+            'Scenarios Worsened': int((delta > 0).sum()),
+        })
+        for column in RUN_COMPLIANCE_COLUMNS:
+            before = baseline[column][both]
+            after = run[column][both]
+            flip_rows.append({
+                'Policy Run': name,
+                'Compliance Check': column,
+                'Breach -> Compliant': int((~before & after).sum()),
+                'Compliant -> Breach': int((before & ~after).sum()),
+            })
+
+    category_totals = pd.DataFrame(
+        {
+            name: np.bincount(
+                codes,
+                weights=np.nan_to_num(np.where(
+                    store['runs'][name]['Simulated'], store['runs'][name]['Residual Financial Impact'], 0.0
+                )),
+                minlength=num_categories,
+            )
+            for name in names
+        },
+        index=pd.Index(store['categories'], name='Risk Category'),
+    )
+
+    return {
+        'baseline': names[0],
+        'deltas': pd.DataFrame(delta_rows),
+        'compliance_flips': pd.DataFrame(flip_rows),
+        'category_totals': category_totals,
+    }
@@ -0,0 +1,199 @@
+import pandas as pd
+import numpy as np
+
+COMPARISONS = {
+    '<=': np.less_equal,
+    '<': np.less,
+    '>=': np.greater_equal,
+    '>': np.greater,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+AGGREGATES = ['sum', 'mean', 'count', 'max', 'min']
+
+
+def default_rules(risk_appetite_thresholds):
+    """
+    Expresses the flat risk appetite thresholds as rules, mirroring the checks in `simulate_scenario_outcome`
+    (operational compliance is checked against the initial operational impact).
+    """
+    return [
+        {'name': 'Financial Compliance', 'column': 'Residual Financial Impact', 'op': '<=',
+         'value': risk_appetite_thresholds['Max Acceptable Financial Loss per Incident']},
+        {'name': 'Operational Compliance', 'column': 'Initial Operational Impact', 'op': '<=',
+         'value': risk_appetite_thresholds['Max Acceptable Incidents per Period']},
+        {'name': 'Reputational Compliance', 'column': 'Residual Reputational Impact', 'op': '<=',
+         'value': risk_appetite_thresholds['Max Acceptable Reputational Impact Score']},
+    ]
+
+
+def compile_rules(rules):
+    """
+    Compiles a list of rule specifications into a single vectorized evaluator.
+
+    Each rule is a dictionary with a 'name' and one of:
+    *   a limit: 'column', 'op' and 'value', checked on every row;
+    *   an aggregate limit: additionally 'aggregate' (sum, mean, count, max, min) and 'by' (a column to group by);
+        the group statistic is checked and every row inherits its group's result;
+    *   a composite: 'all' or 'any' holding a list of nested rules.
+    Limits and aggregate limits accept an optional 'category' that scopes them to one 'Risk Category';
+    rows outside that category always pass.
+
+    Returns a function that takes the simulation log and returns a DataFrame with one boolean
+    column per top-level rule (True means within appetite).
+    """
+    if not isinstance(rules, list):
+        raise TypeError("Rules must be a list of rule specifications.")
+
+    names = [rule.get('name') if isinstance(rule, dict) else None for rule in rules]
+    if any(not name for name in names):
+        raise ValueError("Every top-level rule needs a name.")
+    if len(set(names)) != len(names):
+        raise ValueError("Rule names must be unique.")
+
+    required_columns = set()
+    predicates = [_compile_rule(rule, required_columns) for rule in rules]
+
+    def evaluate(simulation_log):
+        missing = required_columns.difference(simulation_log.columns)
+        if missing:
+            raise KeyError(f"Simulation log is missing columns required by the rules: {sorted(missing)}")
+        # Columns are converted once and shared by every predicate, as are group codes and aggregates
+        context = {
+            'num_rows': len(simulation_log),
+            'columns': {column: simulation_log[column] for column in required_columns},
+            'numeric': {},
+            'masks': {},
+            'groups': {},
+            'aggregates': {},
+        }
+        return pd.DataFrame(
+            {name: predicate(context) for name, predicate in zip(names, predicates)},
+            index=simulation_log.index,
+        )
+
+    evaluate.rule_names = names
+    evaluate.required_columns = frozenset(required_columns)
+    return evaluate
+
+
+def _compile_rule(rule, required_columns):
+    """Compiles one rule specification into a predicate over the evaluation context."""
+    if not isinstance(rule, dict):
+        raise ValueError(f"Rule must be a dictionary, got {rule!r}.")
+
+    for composite, combine in (('all', np.logical_and), ('any', np.logical_or)):
+        if composite in rule:
+            children = rule[composite]
+            if not isinstance(children, list) or not children:
+                raise ValueError(f"Composite rule '{composite}' needs a non-empty list of rules.")
+            child_predicates = [_compile_rule(child, required_columns) for child in children]
+
+            def composite_predicate(context, child_predicates=child_predicates, combine=combine):
+                return combine.reduce([predicate(context) for predicate in child_predicates])
+            return composite_predicate
+
+    column = rule.get('column')
+    op = rule.get('op', '<=')
+    if column is None or 'value' not in rule:
+        raise ValueError(f"Rule {rule.get('name', rule)!r} needs a 'column' and a 'value'.")
+    if op not in COMPARISONS:
+        raise ValueError(f"Unsupported comparison '{op}'. Use one of {list(COMPARISONS)}.")
+    compare = COMPARISONS[op]
+    value = rule['value']
+    category = rule.get('category')
+    aggregate = rule.get('aggregate')
+
+    required_columns.add(column)
+    if category is not None:
+        required_columns.add('Risk Category')
+
+    if aggregate is None:
+        def limit_predicate(context):
+            if isinstance(value, str):
+                # String values (e.g. 'Chosen Action' == 'Accept') are compared against the raw column
+                passed = compare(context['columns'][column].to_numpy(), value) if op not in ('==', '!=') \
+                    else compare(_equals_mask(context, column, value), True)
+            else:
+                passed = compare(_numeric(context, column), value)
+            if category is not None:
+                passed = passed | ~_equals_mask(context, 'Risk Category', category)
+            return passed
+        return limit_predicate
+
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"Unsupported aggregate '{aggregate}'. Use one of {AGGREGATES}.")
+    by = rule.get('by', 'Risk Category')
+    required_columns.add(by)
+
+    def aggregate_predicate(context):
+        codes, uniques = _group_codes(context, by, category)
+        statistic = _group_statistic(context, column, aggregate, by, category, codes, len(uniques))
+        # Rows outside the scope carry code -1, which picks the trailing True
+        return np.append(compare(statistic, value), True)[codes]
+    return aggregate_predicate
+
+
+def _numeric(context, column):
+    """Returns `column` as a float array, converting it once per evaluation."""
+    if column not in context['numeric']:
+        context['numeric'][column] = pd.to_numeric(context['columns'][column], errors='coerce').to_numpy(dtype=float)
+    return context['numeric'][column]
+
+
+def _equals_mask(context, column, value):
+    """Returns `column == value` using codes factorized once per column, so repeated string checks stay cheap."""
+    key = (column, value)
+    if key not in context['masks']:
+        codes, uniques = _group_codes(context, column, None)
+        matches = np.flatnonzero(uniques == value)
+        context['masks'][key] = codes == matches[0] if matches.size else np.zeros(context['num_rows'], dtype=bool)
+    return context['masks'][key]
+
+
+def _group_codes(context, by, category):
+    """Factorizes the group-by column once; rows outside `category` get code -1. Returns (codes, uniques)."""
+    key = (by, category)
+    if key not in context['groups']:
+        if category is None:
+            codes, uniques = context['columns'][by].factorize()
+            context['groups'][key] = (codes, np.asarray(uniques, dtype=object))
+        else:
+            codes, uniques = _group_codes(context, by, None)
+            context['groups'][key] = (np.where(_equals_mask(context, 'Risk Category', category), codes, -1), uniques)
+    return context['groups'][key]
+
+
+def _group_statistic(context, column, aggregate, by, category, codes, num_groups):
+    """Computes a per-group statistic with bincount/ufunc reductions, memoized across rules."""
+    key = (column, aggregate, by, category)
+    if key not in context['aggregates']:
+        # Shifting by one sends out-of-scope rows (code -1) to a bin that is dropped
+        shifted = codes + 1
+        values = _numeric(context, column)
+        counts = np.bincount(shifted, minlength=num_groups + 1)[1:]
+        if aggregate == 'count':
+            statistic = counts.astype(float)
+        elif aggregate in ('sum', 'mean'):
+            statistic = np.bincount(shifted, weights=np.nan_to_num(values), minlength=num_groups + 1)[1:]
+            if aggregate == 'mean':
+                statistic = statistic / np.maximum(counts, 1)
+        else:
+            in_scope = codes >= 0
+            reduce = np.maximum if aggregate == 'max' else np.minimum
+            statistic = np.full(num_groups, -np.inf if aggregate == 'max' else np.inf)
+            reduce.at(statistic, codes[in_scope], values[in_scope])
+        context['aggregates'][key] = statistic
+    return context['aggregates'][key]
+
+
+def summarize_rule_results(rule_results):
+    """Counts rows within and outside appetite for each rule column."""
+    breaches = (~rule_results).sum()
+    return pd.DataFrame({
+        'Rule': rule_results.columns,
+        'Within Appetite': (len(rule_results) - breaches).to_numpy(),
+        'Breaches': breaches.to_numpy(),
+        'Breach Rate': (breaches / max(len(rule_results), 1)).to_numpy(),
+    })
@@ -0,0 +1,28 @@
+import pandas as pd
+import numpy as np
+
+# Drill-down dimensions shared by every scenario generator
+BUSINESS_UNITS = ['Retail Banking', 'Corporate Banking', 'Wealth Management', 'Operations', 'Technology']
+SUB_CATEGORIES = {
+    'Strategic': ['Market Entry', 'M&A Integration', 'Business Model'],
+    'Financial': ['Credit', 'Market', 'Liquidity'],
+    'Operational': ['Process Failure', 'IT Outage', 'Fraud'],
+    'Compliance': ['Regulatory Change', 'AML/KYC', 'Data Privacy'],
+    'Reputational': ['Media', 'Customer Conduct', 'ESG'],
+}
+PERIODS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+def draw_drill_down_dimensions(risk_category):
+    """
+    Draws a Business Unit, a Sub-Category of each scenario's risk category and a Period for the scenarios in
+    `risk_category`, using NumPy's global random state so seeded generators stay reproducible.
+    """
+    num_scenarios = len(risk_category)
+    category_codes = pd.Categorical(risk_category, categories=list(SUB_CATEGORIES)).codes
+    sub_categories = np.array(list(SUB_CATEGORIES.values()))
+    return {
+        'Business Unit': np.random.choice(BUSINESS_UNITS, num_scenarios),
+        'Sub-Category': sub_categories[category_codes, np.random.randint(0, sub_categories.shape[1], num_scenarios)],
+        'Period': np.random.choice(PERIODS, num_scenarios),
+    }
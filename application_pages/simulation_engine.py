@@ -0,0 +1,93 @@
+import pandas as pd
+import numpy as np
+from application_pages.insurance_tower import apply_tower, tower_from_params
+
+ACTIONS = ['Accept', 'Mitigate', 'Transfer', 'Eliminate']
+
+# Descriptive dimensions carried from the scenarios into the log; older scenario sets may not have them
+SCENARIO_DIMENSIONS = ['Business Unit', 'Sub-Category', 'Period']
+
+LOG_COLUMNS = [
+    'Scenario ID', 'Risk Category', 'Business Unit', 'Sub-Category', 'Period', 'Chosen Action',
+    'Initial Likelihood', 'Initial Financial Impact', 'Initial Reputational Impact', 'Initial Operational Impact',
+    'Residual Likelihood', 'Residual Financial Impact', 'Residual Reputational Impact', 'Residual Operational Impact',
+    'Financial Compliance', 'Operational Compliance', 'Reputational Compliance'
+]
+
+
+def apply_action(likelihood, financial, reputational, operational, action, action_params):
+    """
+    Vectorized counterpart of the action formulas in `simulate_scenario_outcome`.
+    Inputs are numpy arrays (or scalars) and broadcast against each other and against array-valued `action_params`.
+    Returns the residual (likelihood, financial, reputational, operational) arrays.
+    """
+    if action == 'Accept':
+        return likelihood, financial, reputational, operational
+
+    if action == 'Mitigate':
+        impact_reduction = action_params.get('Mitigation Factor (Impact Reduction %)', 0.0)
+        likelihood_reduction = action_params.get('Mitigation Factor (Likelihood Reduction %)', 0.0)
+        return (
+            likelihood * (1 - likelihood_reduction),
+            financial * (1 - impact_reduction),
+            reputational * (1 - impact_reduction),
+            operational * (1 - impact_reduction),
+        )
+
+    if action == 'Transfer':
+        # Aggregate layer limits are consumed by scenarios in array order
+        return likelihood, apply_tower(financial, tower_from_params(action_params)), reputational, operational
+
+    if action == 'Eliminate':
+        zeros = np.zeros(np.broadcast(likelihood, financial).shape)
+        return zeros, zeros, zeros, zeros
+
+    raise ValueError("Invalid action specified.")
+
+
+def evaluate_compliance(initial_operational, residual_financial, residual_reputational, risk_appetite_thresholds):
+    """
+    Vectorized compliance checks, matching `simulate_scenario_outcome`
+    (operational compliance is checked against the initial operational impact).
+    Returns the (financial, operational, reputational) boolean arrays.
+    """
+    return (
+        residual_financial <= risk_appetite_thresholds['Max Acceptable Financial Loss per Incident'],
+        initial_operational <= risk_appetite_thresholds['Max Acceptable Incidents per Period'],
+        residual_reputational <= risk_appetite_thresholds['Max Acceptable Reputational Impact Score'],
+    )
+
+
+def simulate_outcomes(scenarios, action, action_params, risk_appetite_thresholds):
+    """
+    Applies one action to every row of the `scenarios` DataFrame at once.
+    Returns a DataFrame with the simulation log columns, one row per scenario.
+    """
+    likelihood = scenarios['Initial Likelihood'].to_numpy(dtype=float)
+    financial = scenarios['Initial Impact (Financial)'].to_numpy(dtype=float)
+    reputational = scenarios['Initial Impact (Reputational)'].to_numpy(dtype=float)
+    operational = scenarios['Initial Impact (Operational)'].to_numpy(dtype=float)
+
+    residual = apply_action(likelihood, financial, reputational, operational, action, action_params)
+    compliance = evaluate_compliance(operational, residual[1], residual[2], risk_appetite_thresholds)
+
+    return pd.DataFrame({
+        'Scenario ID': scenarios['Scenario ID'].to_numpy(),
+        'Risk Category': scenarios['Risk Category'].to_numpy(),
+        **{
+            dimension: scenarios[dimension].to_numpy() if dimension in scenarios.columns else 'Unassigned'
+            for dimension in SCENARIO_DIMENSIONS
+        },
+        'Chosen Action': action,
+        'Initial Likelihood': likelihood,
+        'Initial Financial Impact': financial,
+        'Initial Reputational Impact': reputational,
+        'Initial Operational Impact': operational,
+        'Residual Likelihood': residual[0],
+        'Residual Financial Impact': residual[1],
+        'Residual Reputational Impact': residual[2],
+        'Residual Operational Impact': residual[3],
+        'Financial Compliance': compliance[0],
+        'Operational Compliance': compliance[1],
+        'Reputational Compliance': compliance[2],
+    }, columns=LOG_COLUMNS)
@@ -0,0 +1,134 @@
+import pandas as pd
+import numpy as np
+from application_pages.simulation_engine import apply_action, evaluate_compliance
+from application_pages.insurance_tower import tower_from_params, tower_payouts, validate_tower
+
+SHOCK_FIELDS = {
+    'Likelihood Multiplier': 1.0,
+    'Financial Multiplier': 1.0,
+    'Reputational Multiplier': 1.0,
+    'Operational Multiplier': 1.0,
+    'Coverage Shift': 0.0,
+}
+
+# Rows apply to one 'Risk Category' or to 'All'; several rows for the same stress scenario combine
+DEFAULT_STRESS_SCENARIOS = pd.DataFrame([
+    {'Stress Scenario': 'Baseline', 'Risk Category': 'All'},
+    {'Stress Scenario': 'Severe Market Downturn', 'Risk Category': 'Financial',
+     'Likelihood Multiplier': 1.5, 'Financial Multiplier': 2.0},
+    {'Stress Scenario': 'Severe Market Downturn', 'Risk Category': 'Strategic',
+     'Likelihood Multiplier': 1.3, 'Financial Multiplier': 1.5},
+    {'Stress Scenario': 'Cyber Event', 'Risk Category': 'Operational',
+     'Likelihood Multiplier': 2.0, 'Financial Multiplier': 1.5, 'Operational Multiplier': 2.0},
+    {'Stress Scenario': 'Cyber Event', 'Risk Category': 'Reputational', 'Reputational Multiplier': 1.5},
+    {'Stress Scenario': 'Hard Insurance Market', 'Risk Category': 'All', 'Coverage Shift': -0.3},
+    {'Stress Scenario': 'Regulatory Crackdown', 'Risk Category': 'Compliance',
+     'Likelihood Multiplier': 1.8, 'Financial Multiplier': 1.8, 'Reputational Multiplier': 1.3},
+], columns=['Stress Scenario', 'Risk Category'] + list(SHOCK_FIELDS)).fillna(SHOCK_FIELDS)
+
+
+def build_shock_matrices(stress_table, categories):
+    """
+    Turns a stress table (one row per stress scenario and 'Risk Category', or 'All') into K x C multiplier
+    matrices over `categories` and a length-K coverage shift vector. Multipliers of matching rows multiply,
+    coverage shifts add. Returns (stress names, {field: array}).
+    """
+    missing = {'Stress Scenario', 'Risk Category'}.difference(stress_table.columns)
+    if missing:
+        raise KeyError(f"Stress table is missing columns: {sorted(missing)}")
+    table = stress_table.copy()
+    for field, default in SHOCK_FIELDS.items():
+        table[field] = pd.to_numeric(table[field], errors='coerce').fillna(default) if field in table.columns else default
+    if (table[[field for field in SHOCK_FIELDS if field != 'Coverage Shift']] < 0).any().any():
+        raise ValueError("Stress multipliers must be non-negative.")
+
+    names = list(pd.unique(table['Stress Scenario']))
+    category_index = {category: i for i, category in enumerate(categories)}
+    shocks = {field: np.full((len(names), len(categories)), default, dtype=float) for field, default in SHOCK_FIELDS.items()}
+    for row in table.to_dict(orient='records'):
+        k = names.index(row['Stress Scenario'])
+        if row['Risk Category'] == 'All':
+            columns = slice(None)
+        elif row['Risk Category'] in category_index:
+            columns = category_index[row['Risk Category']]
+        else:
+            continue  # Category not present in this universe
+        for field in SHOCK_FIELDS:
+            if field == 'Coverage Shift':
+                shocks[field][k, columns] += row[field]
+            else:
+                shocks[field][k, columns] *= row[field]
+    return names, shocks
+
+
+def run_stress_test(scenarios, stress_table, action, action_params, risk_appetite_thresholds,
+                    memory_budget_mb=256):
+    """
+    Applies K stress scenarios to all N scenarios as one broadcast (K x N) evaluation of the action and
+    compliance logic, processed in chunks of scenarios sized to `memory_budget_mb`.
+    Coverage shifts move the share of every Transfer tower layer (clipped to [0, 1]) and aggregate layer limits
+    are consumed across chunks in scenario order; likelihoods are capped at 1.
+    Returns one row per stress scenario with breach rates and residual losses.
+    """
+    category_codes, categories = pd.factorize(scenarios['Risk Category'])
+    names, shocks = build_shock_matrices(stress_table, list(categories))
+    num_stresses, num_scenarios = len(names), len(scenarios)
+
+    likelihood = scenarios['Initial Likelihood'].to_numpy(dtype=float)
+    financial = scenarios['Initial Impact (Financial)'].to_numpy(dtype=float)
+    reputational = scenarios['Initial Impact (Reputational)'].to_numpy(dtype=float)
+    operational = scenarios['Initial Impact (Operational)'].to_numpy(dtype=float)
+
+    # About a dozen K x chunk float64 temporaries are alive at once
+    chunk = max(1, int(memory_budget_mb * 2 ** 20 // (12 * 8 * max(num_stresses, 1))))
+    totals = {name: np.zeros(num_stresses) for name in [
+        'Financial Breaches', 'Operational Breaches', 'Reputational Breaches', 'Any Breaches',
+        'Total Residual Financial Impact', 'Expected Residual Loss'
+    ]}
+    max_residual = np.zeros(num_stresses)
+    if action == 'Transfer':
+        tower = validate_tower(tower_from_params(action_params))
+        aggregate_used = None
+
+    for start in range(0, num_scenarios, chunk):
+        stop = min(start + chunk, num_scenarios)
+        codes = category_codes[start:stop]
+        stressed = (
+            np.minimum(likelihood[start:stop] * shocks['Likelihood Multiplier'][:, codes], 1.0),
+            financial[start:stop] * shocks['Financial Multiplier'][:, codes],
+            reputational[start:stop] * shocks['Reputational Multiplier'][:, codes],
+            operational[start:stop] * shocks['Operational Multiplier'][:, codes],
+        )
+        if action == 'Transfer':
+            stressed_tower = [
+                dict(layer, **{'Share (%)': np.clip(layer['Share (%)'] + shocks['Coverage Shift'][:, codes], 0.0, 1.0)})
+                for layer in tower
+            ]
+            payouts, aggregate_used = tower_payouts(stressed[1], stressed_tower, aggregate_used)
+            residual = (stressed[0], np.maximum(stressed[1] - payouts.sum(axis=0), 0.0), stressed[2], stressed[3])
+        else:
+            residual = apply_action(*stressed, action, action_params)
+        residual_likelihood = np.broadcast_to(residual[0], (num_stresses, stop - start))
+        residual_financial = np.broadcast_to(residual[1], (num_stresses, stop - start))
+        financial_ok, operational_ok, reputational_ok = evaluate_compliance(
+            stressed[3], residual_financial, residual[2], risk_appetite_thresholds
+        )
+        totals['Financial Breaches'] += (~financial_ok).sum(axis=1)
+        totals['Operational Breaches'] += (~operational_ok).sum(axis=1)
+        totals['Reputational Breaches'] += (~reputational_ok).sum(axis=1)
+        totals['Any Breaches'] += (~(financial_ok & operational_ok & reputational_ok)).sum(axis=1)
+        totals['Total Residual Financial Impact'] += residual_financial.sum(axis=1)
+        totals['Expected Residual Loss'] += (residual_likelihood * residual_financial).sum(axis=1)
+        max_residual = np.maximum(max_residual, residual_financial.max(axis=1))
+
+    scale = 1.0 / max(num_scenarios, 1)
+    return pd.DataFrame({
+        'Stress Scenario': names,
+        'Financial Breach Rate': totals['Financial Breaches'] * scale,
+        'Operational Breach Rate': totals['Operational Breaches'] * scale,
+        'Reputational Breach Rate': totals['Reputational Breaches'] * scale,
+        'Any Breach Rate': totals['Any Breaches'] * scale,
+        'Total Residual Financial Impact': totals['Total Residual Financial Impact'],
+        'Expected Residual Loss': totals['Expected Residual Loss'],
+        'Max Residual Financial Impact': max_residual,
+    })
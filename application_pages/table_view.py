@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+
+def filter_sort_positions(df, filters=None, sort_by=None, ascending=True):
+    """
+    Computes the row positions of `df` that pass `filters`, ordered by `sort_by`.
+    `filters` maps a column name to the list of allowed values; an empty list or None keeps every row.
+    Returns a numpy array of integer positions suitable for `df.iloc`.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, allowed_values in (filters or {}).items():
+        if not allowed_values:
+            continue
+        if column not in df.columns:
+            raise KeyError(f"Filter column '{column}' not found in table.")
+        mask &= df[column].isin(allowed_values).to_numpy()
+
+    positions = np.flatnonzero(mask)
+
+    if sort_by is not None:
+        if sort_by not in df.columns:
+            raise KeyError(f"Sort column '{sort_by}' not found in table.")
+        sort_values = df[sort_by].to_numpy()[positions]
+        if sort_values.dtype == object:
+            # Object columns (e.g. categories mixed with NaN) are sorted by their ordered codes
+            sort_values = pd.factorize(sort_values, sort=True)[0]
+        # Stable sort keeps the original row order among ties, in both directions
+        if ascending:
+            order = np.argsort(sort_values, kind='stable')
+        else:
+            order = (len(sort_values) - 1 - np.argsort(sort_values[::-1], kind='stable'))[::-1]
+        positions = positions[order]
+
+    return positions
+
+
+def get_page(df, positions, page, page_size):
+    """
+    Returns the slice of `df` for the 1-based `page` of `positions`.
+    Only `page_size` rows are materialized regardless of the table size.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive.")
+    num_pages = max(1, -(-len(positions) // page_size))
+    page = min(max(1, int(page)), num_pages)
+    start = (page - 1) * page_size
+    return df.iloc[positions[start:start + page_size]]
+
+
+def render_paginated_table(df, key, version, filter_columns=(), page_size_options=(25, 50, 100, 250)):
+    """
+    Renders `df` as a filterable, sortable table that only sends the visible page to the browser.
+    The filtered and sorted row order is cached in session state under `key`, so turning a page
+    re-uses it and only slices `page_size` rows. `version` must change whenever `df` changes.
+    """
+    cache_key = f'_table_view_{key}'
+    cache = st.session_state.get(cache_key)
+    # The filter choices only need to be computed once per table version
+    if cache is None or cache['version'] != version:
+        cache = {
+            'version': version,
+            'choices': {
+                column: sorted(pd.unique(df[column].dropna()).tolist(), key=str)
+                for column in filter_columns if column in df.columns
+            },
+            'signature': None,
+            'positions': None,
+        }
+        st.session_state[cache_key] = cache
+
+    filter_cols = st.columns(max(1, len(cache['choices'])))
+    filters = {}
+    for col, (column, choices) in zip(filter_cols, cache['choices'].items()):
+        with col:
+            filters[column] = st.multiselect(
+                f"Filter: {column}", choices, key=f'{key}_filter_{column}',
+                help="Leave empty to show all values."
+            )
+
+    sort_col, order_col, size_col = st.columns(3)
+    with sort_col:
+        sort_by = st.selectbox(
+            "Sort by", ['(original order)'] + list(df.columns), key=f'{key}_sort_by'
+        )
+    with order_col:
+        ascending = st.radio(
+            "Order", ['Ascending', 'Descending'], horizontal=True, key=f'{key}_order'
+        ) == 'Ascending'
+    with size_col:
+        page_size = st.selectbox("Rows per page", list(page_size_options), key=f'{key}_page_size')
+
+    sort_by = None if sort_by == '(original order)' else sort_by
+    signature = (tuple((column, tuple(values)) for column, values in filters.items()), sort_by, ascending)
+    if cache['signature'] != signature:
+        cache['positions'] = filter_sort_positions(df, filters, sort_by, ascending)
+        cache['signature'] = signature
+
+    positions = cache['positions']
+    num_pages = max(1, -(-len(positions) // page_size))
+    # Narrowing the filters can leave the stored page beyond the last one
+    if st.session_state.get(f'{key}_page', 1) > num_pages:
+        st.session_state[f'{key}_page'] = num_pages
+    page = st.number_input("Page", min_value=1, max_value=num_pages, step=1, key=f'{key}_page')
+    st.dataframe(get_page(df, positions, page, page_size))
+    st.caption(f"Page {page:,} of {num_pages:,} — {len(positions):,} of {len(df):,} rows match the current filters.")
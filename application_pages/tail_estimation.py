@@ -0,0 +1,119 @@
+import numpy as np
+from statistics import NormalDist
+
+# Parameters of the lognormal financial impact draw in `definitions.generate_synthetic_data`
+FINANCIAL_IMPACT_LOG_MEAN = 5.0
+FINANCIAL_IMPACT_LOG_SIGMA = 2.0
+
+
+def lognormal_tail_probability(threshold, mu=FINANCIAL_IMPACT_LOG_MEAN, sigma=FINANCIAL_IMPACT_LOG_SIGMA):
+    """Exact P(X > threshold) for X ~ Lognormal(mu, sigma), used as a reference for the estimators."""
+    if threshold <= 0:
+        return 1.0
+    return 1.0 - NormalDist(mu, sigma).cdf(np.log(threshold))
+
+
+def lognormal_quantile(confidence, mu=FINANCIAL_IMPACT_LOG_MEAN, sigma=FINANCIAL_IMPACT_LOG_SIGMA):
+    """Exact quantile (VaR) of X ~ Lognormal(mu, sigma) at `confidence`."""
+    return float(np.exp(NormalDist(mu, sigma).inv_cdf(confidence)))
+
+
+def _draw_tilted(num_trials, mu, sigma, shift, seed):
+    """
+    Draws log-losses from the shifted proposal N(mu + shift, sigma) (exponential tilting of the normal)
+    and returns the losses with their likelihood-ratio weights back to N(mu, sigma).
+    """
+    if not isinstance(num_trials, int) or num_trials < 2:
+        raise ValueError("num_trials must be an integer of at least 2.")
+    if sigma <= 0:
+        raise ValueError("sigma must be positive.")
+    rng = np.random.default_rng(seed)
+    log_losses = rng.normal(mu + shift, sigma, size=num_trials)
+    weights = np.exp(-shift * (log_losses - mu) / sigma ** 2 + shift ** 2 / (2 * sigma ** 2))
+    return np.exp(log_losses), weights
+
+
+def _effective_sample_size(weights):
+    """Kish effective sample size of a weighted sample."""
+    return float(weights.sum() ** 2 / np.square(weights).sum())
+
+
+def _equivalent_plain_trials(probability, std_error):
+    """Plain Monte Carlo trials needed to estimate `probability` with the same standard error."""
+    if std_error <= 0:
+        return np.inf
+    return float(probability * (1 - probability) / std_error ** 2)
+
+
+def estimate_breach_probability(threshold, num_trials, mu=FINANCIAL_IMPACT_LOG_MEAN,
+                                sigma=FINANCIAL_IMPACT_LOG_SIGMA, shift=None, seed=None):
+    """
+    Estimates P(loss > threshold) for a lognormal loss by importance sampling.
+    The default proposal is centred on the threshold (shift = log(threshold) - mu); shift=0 is plain Monte Carlo.
+    Returns a dictionary with the estimate, its standard error, the effective sample size and the number
+    of plain Monte Carlo trials that would give the same standard error.
+    """
+    if threshold <= 0:
+        raise ValueError("threshold must be positive.")
+    if shift is None:
+        shift = max(0.0, np.log(threshold) - mu)
+
+    losses, weights = _draw_tilted(num_trials, mu, sigma, shift, seed)
+    contributions = weights * (losses > threshold)
+    estimate = float(contributions.mean())
+    std_error = float(contributions.std(ddof=1) / np.sqrt(num_trials))
+
+    return {
+        'Estimate': estimate,
+        'Standard Error': std_error,
+        'Relative Error': std_error / estimate if estimate > 0 else np.inf,
+        'Effective Sample Size': _effective_sample_size(weights),
+        'Equivalent Plain Trials': _equivalent_plain_trials(estimate, std_error),
+        'Trials': num_trials,
+        'Shift': float(shift),
+    }
+
+
+def estimate_tail_risk(confidence, num_trials, mu=FINANCIAL_IMPACT_LOG_MEAN,
+                       sigma=FINANCIAL_IMPACT_LOG_SIGMA, shift=None, seed=None):
+    """
+    Estimates VaR and Expected Shortfall of a lognormal loss at `confidence` by importance sampling.
+    The default proposal is centred on the true quantile of the log-loss (shift = sigma * z_confidence);
+    shift=0 is plain Monte Carlo. Standard errors are the usual asymptotic ones: the tail-probability error
+    divided by the loss density for VaR, and the spread of the weighted excess losses for ES.
+    Returns a dictionary of estimates, standard errors, the effective sample size and the number of plain
+    Monte Carlo trials that would estimate VaR as precisely.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+    tail = 1.0 - confidence
+    if shift is None:
+        shift = sigma * NormalDist().inv_cdf(confidence)
+
+    losses, weights = _draw_tilted(num_trials, mu, sigma, shift, seed)
+
+    # The weighted tail probability above each sorted loss; VaR is where it first reaches the tail mass
+    order = np.argsort(losses)[::-1]
+    sorted_losses = losses[order]
+    tail_probability = np.cumsum(weights[order]) / num_trials
+    index = min(int(np.searchsorted(tail_probability, tail)), num_trials - 1)
+    var = float(sorted_losses[index])
+
+    excess = weights * np.maximum(losses - var, 0.0)
+    expected_shortfall = var + float(excess.mean()) / tail
+
+    exceed = weights * (losses > var)
+    density = NormalDist(mu, sigma).pdf(np.log(var)) / var
+    var_std_error = float(exceed.std(ddof=1) / np.sqrt(num_trials)) / density
+    es_std_error = float(excess.std(ddof=1) / np.sqrt(num_trials)) / tail
+
+    return {
+        'VaR': var,
+        'VaR Standard Error': var_std_error,
+        'Expected Shortfall': expected_shortfall,
+        'ES Standard Error': es_std_error,
+        'Effective Sample Size': _effective_sample_size(weights),
+        'Equivalent Plain Trials': _equivalent_plain_trials(tail, var_std_error * density),
+        'Trials': num_trials,
+        'Shift': float(shift),
+    }
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from application_pages.scenario_dimensions import draw_drill_down_dimensions
 
 def generate_synthetic_data(num_scenarios, seed=None):
     """Generates synthetic risk scenario data."""
@@ -18,6 +19,9 @@ def generate_synthetic_data(num_scenarios, seed=None):
         'Initial Impact (Operational)': np.random.randint(1, 6, size=num_scenarios)   # Scale of 1-5
     }
 
+    # Drill-down dimensions, drawn after the original columns so seeded data stays reproducible
+    data.update(draw_drill_down_dimensions(data['Risk Category']))
+
     df = pd.DataFrame(data)
     return df
 
@@ -60,7 +64,8 @@ def simulate_scenario_outcome(scenario_data, action, action_params, risk_appetit
     elif action == 'Transfer':
         deductible = action_params.get('Insurance Deductible ($)', 0)
         coverage_ratio = action_params.get('Insurance Coverage Ratio (%)', 0)
-        residual_financial_impact = deductible + (initial_financial_impact - deductible) * (1 - coverage_ratio)
+        # Insurance covers the ratio of the loss above the deductible (a single layer attaching at the deductible)
+        residual_financial_impact = initial_financial_impact - coverage_ratio * max(initial_financial_impact - deductible, 0)
 
 
     elif action == 'Eliminate':
@@ -0,0 +1,98 @@
+"""
+Load test for the scoring service: concurrent clients post scoring requests for a fixed duration
+and the script reports latency percentiles and throughput.
+
+Run from the repository root, against a running service or an in-process one (--spawn):
+    python -m service.load_test --spawn --clients 32 --duration 10 --rows 10
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from service.scoring_service import make_server
+
+THRESHOLDS = {
+    'Max Acceptable Financial Loss per Incident': 50000.0,
+    'Max Acceptable Incidents per Period': 10,
+    'Max Acceptable Reputational Impact Score': 5.0
+}
+
+
+def make_payload(rows, rng):
+    """Builds a scoring request with `rows` random scenarios."""
+    categories = ['Strategic', 'Financial', 'Operational', 'Compliance', 'Reputational']
+    scenarios = [{
+        'Scenario ID': int(i + 1),
+        'Risk Category': str(rng.choice(categories)),
+        'Initial Likelihood': float(rng.beta(2, 5)),
+        'Initial Impact (Financial)': float(rng.lognormal(5, 2)),
+        'Initial Impact (Reputational)': int(rng.integers(1, 6)),
+        'Initial Impact (Operational)': int(rng.integers(1, 6)),
+    } for i in range(rows)]
+    return {
+        'scenarios': scenarios,
+        'action': 'Mitigate',
+        'action_params': {'Mitigation Factor (Impact Reduction %)': 0.5, 'Mitigation Factor (Likelihood Reduction %)': 0.2},
+        'risk_appetite_thresholds': THRESHOLDS,
+    }
+
+
+def run_client(url, body, stop_at):
+    """Posts `body` repeatedly until `stop_at`, returning the request latencies in seconds and the error count."""
+    latencies = []
+    errors = 0
+    while time.perf_counter() < stop_at:
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except OSError:
+            errors += 1
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the scoring service.")
+    parser.add_argument('--url', default='http://127.0.0.1:8600/score')
+    parser.add_argument('--spawn', action='store_true', help="Start an in-process service on a free port.")
+    parser.add_argument('--clients', type=int, default=32, help="Concurrent clients.")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run.")
+    parser.add_argument('--rows', type=int, default=10, help="Scenarios per request.")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="Micro-batch latency cap (with --spawn).")
+    args = parser.parse_args()
+
+    url = args.url
+    server = None
+    if args.spawn:
+        server = make_server(port=0, max_wait_ms=args.max_wait_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/score"
+
+    body = json.dumps(make_payload(args.rows, np.random.default_rng(0))).encode('utf-8')
+    stop_at = time.perf_counter() + args.duration
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = list(pool.map(lambda _: run_client(url, body, stop_at), range(args.clients)))
+
+    latencies = np.array([latency for client_latencies, _ in results for latency in client_latencies]) * 1000
+    errors = sum(client_errors for _, client_errors in results)
+    if server is not None:
+        server.shutdown()
+
+    print(f"Clients: {args.clients}, rows/request: {args.rows}, duration: {args.duration:.0f}s")
+    if latencies.size == 0:
+        print(f"No successful requests ({errors} errors).")
+        return
+    print(f"Requests: {latencies.size} ok, {errors} errors")
+    print(f"Throughput: {latencies.size / args.duration:,.1f} requests/s ({latencies.size * args.rows / args.duration:,.0f} scenarios/s)")
+    print(f"Latency p50: {np.percentile(latencies, 50):.1f} ms, p99: {np.percentile(latencies, 99):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
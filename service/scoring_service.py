@@ -0,0 +1,241 @@
+"""
+Local HTTP/JSON service that scores risk scenarios against a risk appetite.
+
+POST /score with a JSON body
+    {"scenarios": [{"Scenario ID": 1, "Risk Category": "Financial", "Initial Likelihood": 0.3,
+                    "Initial Impact (Financial)": 60000, "Initial Impact (Reputational)": 4,
+                    "Initial Impact (Operational)": 3}, ...],
+     "action": "Mitigate",
+     "action_params": {"Mitigation Factor (Impact Reduction %)": 0.5},
+     "risk_appetite_thresholds": {"Max Acceptable Financial Loss per Incident": 50000, ...}}
+returns {"outcomes": [...]} with one `simulate_scenario_outcome` result per scenario.
+
+Concurrent requests are coalesced into vectorized micro-batches: the first queued request opens a batch that
+closes after `max_wait_ms` or once `max_batch_rows` rows are queued, and requests sharing the same action,
+parameters and thresholds are scored together.
+
+Run from the repository root:
+    python -m service.scoring_service --port 8600
+"""
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from application_pages.simulation_engine import ACTIONS, simulate_outcomes
+from application_pages.insurance_tower import LAYER_FIELDS, validate_tower
+
+SCENARIO_COLUMNS = [
+    'Scenario ID', 'Risk Category', 'Initial Likelihood',
+    'Initial Impact (Financial)', 'Initial Impact (Reputational)', 'Initial Impact (Operational)'
+]
+NUMERIC_SCENARIO_COLUMNS = [
+    'Initial Likelihood', 'Initial Impact (Financial)', 'Initial Impact (Reputational)', 'Initial Impact (Operational)'
+]
+THRESHOLD_KEYS = [
+    'Max Acceptable Financial Loss per Incident',
+    'Max Acceptable Incidents per Period',
+    'Max Acceptable Reputational Impact Score'
+]
+
+
+def _is_number(value):
+    """True for finite JSON numbers (booleans are not numbers here)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def validate_request(payload):
+    """Checks a scoring request and raises ValueError describing the first problem found."""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object.")
+    scenarios = payload.get('scenarios')
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("'scenarios' must be a non-empty list of scenario rows.")
+    for row in scenarios:
+        if not isinstance(row, dict):
+            raise ValueError("Every scenario must be a JSON object.")
+        missing = [column for column in SCENARIO_COLUMNS if column not in row]
+        if missing:
+            raise ValueError(f"Scenario is missing fields: {missing}")
+        for column in NUMERIC_SCENARIO_COLUMNS:
+            if not _is_number(row[column]):
+                raise ValueError(f"Scenario field '{column}' must be a finite number.")
+    if payload.get('action') not in ACTIONS:
+        raise ValueError(f"'action' must be one of {ACTIONS}.")
+    if not isinstance(payload.get('action_params', {}), dict):
+        raise ValueError("'action_params' must be a JSON object.")
+    tower = payload.get('action_params', {}).get('Insurance Tower')
+    if tower is not None:
+        if not isinstance(tower, list) or not all(isinstance(layer, dict) for layer in tower):
+            raise ValueError("'Insurance Tower' must be a list of layer objects.")
+        for layer in tower:
+            for field in LAYER_FIELDS:
+                value = layer.get(field)
+                if value is not None and not _is_number(value):
+                    raise ValueError(f"Tower layer field '{field}' must be a finite number or null.")
+        validate_tower(tower)
+    thresholds = payload.get('risk_appetite_thresholds')
+    if not isinstance(thresholds, dict) or any(not _is_number(thresholds.get(key)) for key in THRESHOLD_KEYS):
+        raise ValueError(f"'risk_appetite_thresholds' must provide {THRESHOLD_KEYS} as finite numbers.")
+
+
+class MicroBatcher:
+    """Coalesces concurrent scoring requests into vectorized batches on a single worker thread."""
+
+    def __init__(self, max_wait_ms=5.0, max_batch_rows=50_000):
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_rows = max_batch_rows
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='scoring-batcher', daemon=True)
+        self._worker.start()
+
+    def score(self, payload, timeout=30.0):
+        """Queues a validated request and blocks until its outcomes are ready."""
+        pending = {'payload': payload, 'done': threading.Event(), 'outcomes': None, 'error': None}
+        self._queue.put(pending)
+        if not pending['done'].wait(timeout):
+            raise TimeoutError("Scoring request timed out.")
+        if pending['error'] is not None:
+            raise pending['error']
+        return pending['outcomes']
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            rows = len(batch[0]['payload']['scenarios'])
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(pending)
+                rows += len(pending['payload']['scenarios'])
+            self._score_batch(batch)
+
+    def _score_batch(self, batch):
+        groups = {}
+        for pending in batch:
+            payload = pending['payload']
+            key = json.dumps(
+                [payload['action'], payload.get('action_params', {}), payload['risk_appetite_thresholds']],
+                sort_keys=True
+            )
+            if payload.get('action_params', {}).get('Insurance Tower') is not None:
+                # Aggregate layer limits are consumed across the scored rows, so a tower request is never
+                # merged with others: its result must not depend on which requests share its batch
+                key += f"#{id(pending)}"
+            groups.setdefault(key, []).append(pending)
+
+        for members in groups.values():
+            self._score_group(members)
+
+    def _score_group(self, members):
+        payload = members[0]['payload']
+        try:
+            scenarios = pd.DataFrame([row for pending in members for row in pending['payload']['scenarios']])
+            outcomes = simulate_outcomes(
+                scenarios, payload['action'], payload.get('action_params', {}),
+                payload['risk_appetite_thresholds']
+            ).to_dict(orient='records')
+        except Exception as e:
+            if len(members) > 1:
+                # Score requests one by one so a single bad request does not fail its batch-mates
+                for pending in members:
+                    self._score_group([pending])
+                return
+            members[0]['error'] = e
+            members[0]['done'].set()
+            return
+
+        start = 0
+        for pending in members:
+            end = start + len(pending['payload']['scenarios'])
+            pending['outcomes'] = outcomes[start:end]
+            pending['done'].set()
+            start = end
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog large enough for bursts of concurrent clients."""
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def make_handler(batcher):
+    """Builds the request handler class bound to `batcher`."""
+
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            # NaN/Infinity are not valid JSON, so refuse to emit them
+            data = json.dumps(body, default=str, allow_nan=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, {'status': 'ok'})
+            else:
+                self._send_json(404, {'error': 'Not found.'})
+
+        def do_POST(self):
+            if self.path != '/score':
+                self._send_json(404, {'error': 'Not found.'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'null')
+                validate_request(payload)
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            try:
+                self._send_json(200, {'outcomes': batcher.score(payload)})
+            except (KeyError, ValueError, TypeError) as e:
+                self._send_json(400, {'error': str(e)})
+            except TimeoutError as e:
+                self._send_json(503, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass  # Keep the console quiet under load
+
+    return ScoringHandler
+
+
+def make_server(host='127.0.0.1', port=8600, max_wait_ms=5.0, max_batch_rows=50_000):
+    """Creates the threaded HTTP server and its micro-batcher."""
+    batcher = MicroBatcher(max_wait_ms=max_wait_ms, max_batch_rows=max_batch_rows)
+    return ScoringServer((host, port), make_handler(batcher))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve risk appetite scoring over HTTP/JSON.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="Latency cap for filling a micro-batch.")
+    parser.add_argument('--max-batch-rows', type=int, default=50_000, help="Rows that close a micro-batch early.")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.max_wait_ms, args.max_batch_rows)
+    print(f"Scoring service listening on http://{args.host}:{server.server_address[1]}/score")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
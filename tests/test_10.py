@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+from application_pages.convergence import (
+    new_running_stats, update_running_stats, confidence_half_width, simulate_until_converged
+)
+
+@pytest.fixture
+def sample_portfolio():
+    rng = np.random.default_rng(0)
+    return rng.beta(2, 5, 50), rng.lognormal(5, 2, 50)
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(1).normal(3, 2, 1000)
+    stats = new_running_stats()
+    for batch in np.array_split(values, 7):
+        update_running_stats(stats, batch)
+    assert stats['count'] == 1000
+    assert stats['mean'] == pytest.approx(values.mean())
+    assert stats['m2'] / (stats['count'] - 1) == pytest.approx(values.var(ddof=1))
+
+def test_half_width_needs_two_observations():
+    stats = update_running_stats(new_running_stats(), [1.0])
+    assert confidence_half_width(stats) == np.inf
+
+@pytest.mark.parametrize("sampler", ['pseudo', 'antithetic', 'sobol'])
+def test_portfolio_loss_converges(sample_portfolio, sampler):
+    likelihood, impact = sample_portfolio
+    result = simulate_until_converged(likelihood, impact, sampler=sampler, rel_tol=0.02, seed=3)
+    assert result['Converged']
+    assert result['Estimate'] == pytest.approx(likelihood @ impact, rel=0.05)
+    assert result['CI Lower'] <= result['Estimate'] <= result['CI Upper']
+
+def test_sobol_needs_fewer_trials(sample_portfolio):
+    likelihood, impact = sample_portfolio
+    pseudo = simulate_until_converged(likelihood, impact, sampler='pseudo', rel_tol=0.005, seed=4)
+    sobol = simulate_until_converged(likelihood, impact, sampler='sobol', rel_tol=0.005, seed=4)
+    assert sobol['Trials Used'] * 2 < pseudo['Trials Used']
+
+def test_breach_rate_stops_at_max_trials(sample_portfolio):
+    likelihood, impact = sample_portfolio
+    result = simulate_until_converged(likelihood, impact, target='breach_rate', max_incidents=10,
+                                      abs_tol=1e-9, max_trials=1024, seed=5)
+    assert not result['Converged']
+    assert result['Trials Used'] == 1024
+    assert 0 <= result['Estimate'] <= 1
+
+@pytest.mark.parametrize("kwargs", [
+    {'sampler': 'latin'},
+    {'target': 'var'},
+    {'target': 'breach_rate'},
+    {'batch_size': 100},
+])
+def test_invalid_options(sample_portfolio, kwargs):
+    likelihood, impact = sample_portfolio
+    with pytest.raises(ValueError):
+        simulate_until_converged(likelihood, impact, **kwargs)
+
+def test_universes_beyond_the_memory_cap_are_rejected(sample_portfolio, monkeypatch):
+    import application_pages.convergence as convergence
+    likelihood, impact = sample_portfolio
+    monkeypatch.setattr(convergence, 'MAX_UNIFORMS_PER_BLOCK', 128)
+    result = simulate_until_converged(likelihood, impact, sampler='antithetic', max_trials=512, seed=6)
+    assert result['Trials Used'] <= 512
+    with pytest.raises(ValueError):
+        simulate_until_converged(likelihood, impact, severity_sigma=0.5, max_trials=512, seed=6)
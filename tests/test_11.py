@@ -0,0 +1,65 @@
+import pytest
+import pandas as pd
+import numpy as np
+from application_pages.aggregation_cube import build_aggregation_cube, query_cube, dimension_values
+from application_pages.scenario_dimensions import SUB_CATEGORIES, draw_drill_down_dimensions
+
+@pytest.fixture
+def sample_log():
+    rng = np.random.default_rng(0)
+    n = 200
+    return pd.DataFrame({
+        'Risk Category': rng.choice(['Financial', 'Strategic', 'Operational'], n),
+        'Chosen Action': rng.choice(['Accept', 'Mitigate'], n),
+        'Business Unit': rng.choice(['Retail Banking', 'Technology'], n),
+        'Sub-Category': rng.choice(['Credit', 'Fraud', 'Media'], n),
+        'Period': rng.choice(['Q1', 'Q2', 'Q3', 'Q4'], n),
+        'Residual Financial Impact': rng.uniform(0, 1000, n),
+        'Residual Reputational Impact': rng.uniform(0, 10, n),
+        'Residual Operational Impact': rng.uniform(0, 100, n),
+        'Financial Compliance': rng.random(n) < 0.7,
+        'Operational Compliance': rng.random(n) < 0.5,
+        'Reputational Compliance': rng.random(n) < 0.9
+    })
+
+def test_cube_has_every_dimension_subset(sample_log):
+    cube = build_aggregation_cube(sample_log)
+    assert len(cube['cuboids']) == 2 ** 5
+    apex = query_cube(cube)
+    assert apex['Scenarios'].iloc[0] == len(sample_log)
+    assert apex['Residual Financial Impact'].iloc[0] == pytest.approx(sample_log['Residual Financial Impact'].sum())
+
+def test_cube_matches_groupby(sample_log):
+    cube = build_aggregation_cube(sample_log)
+    result = query_cube(cube, ['Business Unit', 'Period']).set_index(['Business Unit', 'Period'])
+    expected = sample_log.groupby(['Business Unit', 'Period'])
+    pd.testing.assert_series_equal(
+        result['Residual Financial Impact'], expected['Residual Financial Impact'].sum(), check_names=False
+    )
+    assert (result['Financial Compliant'] == expected['Financial Compliance'].sum()).all()
+
+def test_cube_slice_and_dice(sample_log):
+    cube = build_aggregation_cube(sample_log)
+    result = query_cube(cube, ['Risk Category'], {'Period': ['Q1', 'Q2'], 'Chosen Action': ['Accept']})
+    subset = sample_log[sample_log['Period'].isin(['Q1', 'Q2']) & (sample_log['Chosen Action'] == 'Accept')]
+    expected = subset.groupby('Risk Category')['Residual Operational Impact'].sum()
+    assert result.set_index('Risk Category')['Residual Operational Impact'].to_dict() == pytest.approx(expected.to_dict())
+    assert result['Scenarios'].sum() == len(subset)
+
+def test_cube_fills_missing_dimensions():
+    log = pd.DataFrame({'Risk Category': ['A', 'B'], 'Chosen Action': ['Accept', 'Accept'], 'Residual Financial Impact': [1.0, 2.0]})
+    cube = build_aggregation_cube(log)
+    assert dimension_values(cube, 'Business Unit') == ['Unassigned']
+    assert query_cube(cube)['Operational Compliant'].iloc[0] == 0
+
+def test_cube_unknown_dimension(sample_log):
+    cube = build_aggregation_cube(sample_log)
+    with pytest.raises(KeyError):
+        query_cube(cube, ['Region'])
+
+def test_drill_down_sub_categories_belong_to_their_risk_category():
+    np.random.seed(1)
+    risk_category = np.random.choice(['Reputational', 'Strategic', 'Financial'], 500)
+    dimensions = draw_drill_down_dimensions(risk_category)
+    assert all(sub in SUB_CATEGORIES[category] for category, sub in zip(risk_category, dimensions['Sub-Category']))
+    assert {len(values) for values in dimensions.values()} == {500}
@@ -0,0 +1,49 @@
+import pytest
+import pandas as pd
+import numpy as np
+from application_pages.bootstrap import bootstrap_group_totals, bootstrap_aggregate_results
+
+@pytest.fixture
+def sample_log():
+    rng = np.random.default_rng(0)
+    n = 400
+    return pd.DataFrame({
+        'Risk Category': rng.choice(['A', 'B'], n),
+        'Chosen Action': rng.choice(['Accept', 'Mitigate'], n),
+        'Residual Financial Impact': rng.lognormal(5, 1, n)
+    })
+
+def test_bootstrap_totals_match_aggregation(sample_log):
+    result = bootstrap_aggregate_results(sample_log, num_resamples=500, seed=1)
+    expected = sample_log.groupby(['Risk Category', 'Chosen Action'])['Residual Financial Impact'].sum().reset_index()
+    pd.testing.assert_series_equal(result['Residual Financial Impact'], expected['Residual Financial Impact'])
+    assert (result['CI Lower'] < result['Residual Financial Impact']).all()
+    assert (result['CI Upper'] > result['Residual Financial Impact']).all()
+
+def test_bootstrap_interval_matches_loop_bootstrap(sample_log):
+    group = sample_log[(sample_log['Risk Category'] == 'A') & (sample_log['Chosen Action'] == 'Accept')]
+    values = group['Residual Financial Impact'].to_numpy()
+    rng = np.random.default_rng(2)
+    loop = [rng.choice(values, len(values)).sum() for _ in range(4000)]
+    expected_width = np.subtract(*np.quantile(loop, [0.975, 0.025]))
+
+    _, lower, upper = bootstrap_group_totals(values, np.zeros(len(values), dtype=int), 1, num_resamples=4000, seed=3)
+    assert upper[0] - lower[0] == pytest.approx(expected_width, rel=0.1)
+
+def test_binned_bootstrap_close_to_exact(sample_log):
+    values = sample_log['Residual Financial Impact'].to_numpy()
+    codes = np.zeros(len(values), dtype=int)
+    _, exact_lower, exact_upper = bootstrap_group_totals(values, codes, 1, num_resamples=4000, seed=4)
+    _, binned_lower, binned_upper = bootstrap_group_totals(values, codes, 1, num_resamples=4000, max_bins_per_group=16, seed=4)
+    assert binned_upper[0] - binned_lower[0] == pytest.approx(exact_upper[0] - exact_lower[0], rel=0.1)
+
+def test_bootstrap_empty_and_missing_columns():
+    assert bootstrap_aggregate_results(pd.DataFrame()).empty
+    with pytest.raises(KeyError):
+        bootstrap_aggregate_results(pd.DataFrame({'Risk Category': ['A'], 'Chosen Action': ['Accept']}))
+
+def test_bootstrap_invalid_options(sample_log):
+    with pytest.raises(ValueError):
+        bootstrap_aggregate_results(sample_log, num_resamples=1)
+    with pytest.raises(ValueError):
+        bootstrap_aggregate_results(sample_log, confidence=1.5)
@@ -0,0 +1,126 @@
+import json
+import threading
+import urllib.request
+import urllib.error
+import pytest
+import pandas as pd
+from application_pages.page2 import simulate_scenario_outcome
+from service.scoring_service import MicroBatcher, make_server, validate_request
+
+THRESHOLDS = {
+    'Max Acceptable Financial Loss per Incident': 50000.0,
+    'Max Acceptable Incidents per Period': 3,
+    'Max Acceptable Reputational Impact Score': 4.0
+}
+
+@pytest.fixture
+def sample_payload():
+    return {
+        'scenarios': [
+            {'Scenario ID': 1, 'Risk Category': 'Financial', 'Initial Likelihood': 0.5,
+             'Initial Impact (Financial)': 100000.0, 'Initial Impact (Reputational)': 5,
+             'Initial Impact (Operational)': 2},
+            {'Scenario ID': 2, 'Risk Category': 'Strategic', 'Initial Likelihood': 0.1,
+             'Initial Impact (Financial)': 20000.0, 'Initial Impact (Reputational)': 2,
+             'Initial Impact (Operational)': 7},
+        ],
+        'action': 'Transfer',
+        'action_params': {'Insurance Deductible ($)': 10000.0, 'Insurance Coverage Ratio (%)': 0.5},
+        'risk_appetite_thresholds': THRESHOLDS,
+    }
+
+def test_batcher_matches_simulate_scenario_outcome(sample_payload):
+    outcomes = MicroBatcher(max_wait_ms=1.0).score(sample_payload)
+    for row, outcome in zip(sample_payload['scenarios'], outcomes):
+        expected = simulate_scenario_outcome(pd.Series(row), sample_payload['action'],
+                                             sample_payload['action_params'], THRESHOLDS)
+        assert outcome == pytest.approx(expected)
+
+def test_batcher_coalesces_concurrent_requests(sample_payload):
+    batcher = MicroBatcher(max_wait_ms=50.0)
+    mitigate = dict(sample_payload, action='Mitigate', action_params={'Mitigation Factor (Impact Reduction %)': 0.5})
+    results = {}
+    threads = [
+        threading.Thread(target=lambda key=key, payload=payload: results.__setitem__(key, batcher.score(payload)))
+        for key, payload in [('transfer', sample_payload), ('mitigate', mitigate), ('again', sample_payload)]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results['transfer'] == results['again']
+    assert [o['Residual Financial Impact'] for o in results['transfer']] == [55000.0, 15000.0]
+    assert [o['Residual Financial Impact'] for o in results['mitigate']] == [50000.0, 10000.0]
+
+def test_batcher_keeps_tower_aggregate_limits_per_request(sample_payload):
+    tower = [{'Attachment ($)': 0.0, 'Limit ($)': None, 'Share (%)': 1.0, 'Aggregate Limit ($)': 1000.0}]
+    payload = dict(
+        sample_payload, scenarios=[dict(sample_payload['scenarios'][0], **{'Initial Impact (Financial)': 1000.0})],
+        action_params={'Insurance Tower': tower}
+    )
+    alone = MicroBatcher(max_wait_ms=1.0).score(payload)
+    assert [o['Residual Financial Impact'] for o in alone] == [0.0]
+
+    batcher = MicroBatcher(max_wait_ms=200.0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(batcher.score(payload))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [o['Residual Financial Impact'] for outcomes in results for o in outcomes] == [0.0, 0.0, 0.0]
+
+@pytest.mark.parametrize("change", [
+    {'scenarios': []},
+    {'action': 'Ignore'},
+    {'risk_appetite_thresholds': {}},
+    {'scenarios': [{'Scenario ID': 1}]},
+    {'scenarios': [{'Scenario ID': 1, 'Risk Category': 'Financial', 'Initial Likelihood': None,
+                    'Initial Impact (Financial)': 1.0, 'Initial Impact (Reputational)': 1,
+                    'Initial Impact (Operational)': 1}]},
+    {'scenarios': [{'Scenario ID': 1, 'Risk Category': 'Financial', 'Initial Likelihood': 0.5,
+                    'Initial Impact (Financial)': '1000', 'Initial Impact (Reputational)': True,
+                    'Initial Impact (Operational)': 1}]},
+    {'risk_appetite_thresholds': dict(THRESHOLDS, **{'Max Acceptable Incidents per Period': float('nan')})},
+    {'action_params': {'Insurance Tower': ['abc']}},
+    {'action_params': {'Insurance Tower': {'Attachment ($)': 0.0}}},
+    {'action_params': {'Insurance Tower': [{'Attachment ($)': 'high'}]}},
+    {'action_params': {'Insurance Tower': [{'Share (%)': [0.5, 0.6]}]}},
+    {'action_params': {'Insurance Tower': [{'Share (%)': 1.5}]}},
+])
+def test_validate_request_rejects_bad_payloads(sample_payload, change):
+    with pytest.raises(ValueError):
+        validate_request(dict(sample_payload, **change))
+
+def test_http_round_trip(sample_payload):
+    server = make_server(port=0, max_wait_ms=1.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/score"
+    try:
+        request = urllib.request.Request(url, data=json.dumps(sample_payload).encode('utf-8'))
+        with urllib.request.urlopen(request, timeout=10) as response:
+            outcomes = json.loads(response.read())['outcomes']
+        assert [o['Financial Compliance'] for o in outcomes] == [False, True]
+
+        bad = urllib.request.Request(url, data=json.dumps({'scenarios': []}).encode('utf-8'))
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(bad, timeout=10)
+        assert error.value.code == 400
+
+        null_likelihood = dict(sample_payload, scenarios=[
+            dict(sample_payload['scenarios'][0], **{'Initial Likelihood': None})
+        ])
+        bad = urllib.request.Request(url, data=json.dumps(null_likelihood).encode('utf-8'))
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(bad, timeout=10)
+        assert error.value.code == 400
+        assert 'Initial Likelihood' in json.loads(error.value.read())['error']
+
+        malformed_tower = dict(sample_payload, action_params={'Insurance Tower': ['abc']})
+        bad = urllib.request.Request(url, data=json.dumps(malformed_tower).encode('utf-8'))
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(bad, timeout=10)
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
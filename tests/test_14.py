@@ -0,0 +1,94 @@
+import pytest
+import pandas as pd
+import numpy as np
+from application_pages.page1 import generate_synthetic_data
+from application_pages.simulation_engine import simulate_outcomes
+from application_pages.stress_testing import DEFAULT_STRESS_SCENARIOS, build_shock_matrices, run_stress_test
+
+THRESHOLDS = {
+    'Max Acceptable Financial Loss per Incident': 50000.0,
+    'Max Acceptable Incidents per Period': 3,
+    'Max Acceptable Reputational Impact Score': 3.0
+}
+
+@pytest.fixture
+def scenarios():
+    return generate_synthetic_data(2000, seed=7)
+
+def _stress_one(scenarios, row, action, action_params):
+    """Reference: applies one uniform stress row scenario by scenario through `simulate_outcomes`."""
+    stressed = scenarios.copy()
+    stressed['Initial Likelihood'] = np.minimum(stressed['Initial Likelihood'] * row['Likelihood Multiplier'], 1.0)
+    stressed['Initial Impact (Financial)'] *= row['Financial Multiplier']
+    stressed['Initial Impact (Reputational)'] = stressed['Initial Impact (Reputational)'] * row['Reputational Multiplier']
+    stressed['Initial Impact (Operational)'] = stressed['Initial Impact (Operational)'] * row['Operational Multiplier']
+    params = dict(action_params)
+    if action == 'Transfer':
+        params['Insurance Coverage Ratio (%)'] = min(max(params['Insurance Coverage Ratio (%)'] + row['Coverage Shift'], 0.0), 1.0)
+    return simulate_outcomes(stressed, action, params, THRESHOLDS)
+
+@pytest.mark.parametrize('action, action_params', [
+    ('Accept', {}),
+    ('Mitigate', {'Mitigation Factor (Impact Reduction %)': 0.4, 'Mitigation Factor (Likelihood Reduction %)': 0.2}),
+    ('Transfer', {'Insurance Deductible ($)': 1000.0, 'Insurance Coverage Ratio (%)': 0.6}),
+])
+def test_stress_test_matches_per_stress_simulation(scenarios, action, action_params):
+    stress_table = pd.DataFrame([
+        {'Stress Scenario': 'Baseline', 'Risk Category': 'All'},
+        {'Stress Scenario': 'Shock', 'Risk Category': 'All', 'Likelihood Multiplier': 1.5, 'Financial Multiplier': 2.0,
+         'Reputational Multiplier': 1.2, 'Operational Multiplier': 1.5, 'Coverage Shift': -0.3},
+    ])
+    # A tiny memory budget forces many chunks
+    results = run_stress_test(scenarios, stress_table, action, action_params, THRESHOLDS, memory_budget_mb=0.01)
+
+    filled = build_shock_matrices(stress_table, ['Financial'])[1]
+    for k, name in enumerate(['Baseline', 'Shock']):
+        row = {field: values[k, 0] for field, values in filled.items()}
+        expected = _stress_one(scenarios, row, action, action_params)
+        result = results.iloc[k]
+        assert result['Stress Scenario'] == name
+        assert result['Financial Breach Rate'] == pytest.approx(1 - expected['Financial Compliance'].mean())
+        assert result['Operational Breach Rate'] == pytest.approx(1 - expected['Operational Compliance'].mean())
+        assert result['Reputational Breach Rate'] == pytest.approx(1 - expected['Reputational Compliance'].mean())
+        compliant = expected[['Financial Compliance', 'Operational Compliance', 'Reputational Compliance']].all(axis=1)
+        assert result['Any Breach Rate'] == pytest.approx(1 - compliant.mean())
+        assert result['Total Residual Financial Impact'] == pytest.approx(expected['Residual Financial Impact'].sum())
+        assert result['Expected Residual Loss'] == pytest.approx(
+            (expected['Residual Likelihood'] * expected['Residual Financial Impact']).sum()
+        )
+
+def test_category_specific_shocks_only_touch_their_category(scenarios):
+    stress_table = pd.DataFrame([
+        {'Stress Scenario': 'Baseline', 'Risk Category': 'All'},
+        {'Stress Scenario': 'Financial Shock', 'Risk Category': 'Financial', 'Financial Multiplier': 3.0},
+    ])
+    results = run_stress_test(scenarios, stress_table, 'Accept', {}, THRESHOLDS).set_index('Stress Scenario')
+    financial = scenarios.loc[scenarios['Risk Category'] == 'Financial', 'Initial Impact (Financial)'].sum()
+    assert results.loc['Financial Shock', 'Total Residual Financial Impact'] == pytest.approx(
+        results.loc['Baseline', 'Total Residual Financial Impact'] + 2 * financial
+    )
+
+def test_shock_rows_combine_and_unknown_categories_are_ignored():
+    stress_table = pd.DataFrame([
+        {'Stress Scenario': 'Combined', 'Risk Category': 'All', 'Financial Multiplier': 2.0, 'Coverage Shift': -0.1},
+        {'Stress Scenario': 'Combined', 'Risk Category': 'Compliance', 'Financial Multiplier': 1.5, 'Coverage Shift': -0.2},
+        {'Stress Scenario': 'Combined', 'Risk Category': 'Unknown', 'Financial Multiplier': 10.0},
+    ])
+    names, shocks = build_shock_matrices(stress_table, ['Financial', 'Compliance'])
+    assert names == ['Combined']
+    np.testing.assert_allclose(shocks['Financial Multiplier'], [[2.0, 3.0]])
+    np.testing.assert_allclose(shocks['Coverage Shift'], [[-0.1, -0.3]])
+    np.testing.assert_allclose(shocks['Likelihood Multiplier'], [[1.0, 1.0]])
+
+def test_default_stress_scenarios_run(scenarios):
+    results = run_stress_test(scenarios, DEFAULT_STRESS_SCENARIOS, 'Transfer',
+                              {'Insurance Deductible ($)': 0.0, 'Insurance Coverage Ratio (%)': 0.8}, THRESHOLDS)
+    assert list(results['Stress Scenario']) == list(pd.unique(DEFAULT_STRESS_SCENARIOS['Stress Scenario']))
+    baseline = results.set_index('Stress Scenario')
+    assert baseline.loc['Hard Insurance Market', 'Total Residual Financial Impact'] > \
+        baseline.loc['Baseline', 'Total Residual Financial Impact']
+
+def test_negative_multipliers_raise(scenarios):
+    stress_table = pd.DataFrame([{'Stress Scenario': 'Bad', 'Risk Category': 'All', 'Financial Multiplier': -1.0}])
+    with pytest.raises(ValueError):
+        run_stress_test(scenarios, stress_table, 'Accept', {}, THRESHOLDS)
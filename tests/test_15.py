@@ -0,0 +1,69 @@
+import pytest
+import pandas as pd
+import numpy as np
+from application_pages.page1 import generate_synthetic_data
+from application_pages.empirical_sampler import (
+    build_alias_table, sample_alias, fit_empirical_model, generate_from_history
+)
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(0)
+    n = 20000
+    category = rng.choice(['Cyber', 'Fraud'], n, p=[0.8, 0.2])
+    return pd.DataFrame({
+        'Scenario ID': np.arange(1, n + 1),
+        'Risk Category': category,
+        'Initial Likelihood': rng.beta(2, 5, n),
+        'Initial Impact (Financial)': np.where(category == 'Cyber', rng.lognormal(5, 2, n), rng.lognormal(8, 0.5, n)),
+        'Initial Impact (Reputational)': rng.integers(1, 6, n),
+        'Initial Impact (Operational)': rng.integers(1, 6, n),
+        'Business Unit': np.where(category == 'Cyber', 'Technology', rng.choice(['Retail Banking', 'Operations'], n)),
+    })
+
+def test_alias_table_reproduces_weights():
+    weights = np.array([0.5, 0.0, 3.0, 1.5, 5.0])
+    prob, alias = build_alias_table(weights)
+    draws = sample_alias(prob, alias, 400_000, np.random.default_rng(1))
+    frequencies = np.bincount(draws, minlength=len(weights)) / len(draws)
+    np.testing.assert_allclose(frequencies, weights / weights.sum(), atol=0.003)
+    assert frequencies[1] == 0.0
+
+@pytest.mark.parametrize('weights', [[], [0.0, 0.0], [1.0, -1.0]])
+def test_alias_table_rejects_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        build_alias_table(weights)
+
+def test_generated_scenarios_follow_history(history):
+    model = fit_empirical_model(history)
+    generated = generate_from_history(model, 200_000, seed=2)
+
+    assert list(generated.columns) == list(generate_synthetic_data(5, seed=0).columns)
+    assert generated['Scenario ID'].tolist()[:3] == [1, 2, 3]
+    assert (generated['Risk Category'] == 'Cyber').mean() == pytest.approx(0.8, abs=0.005)
+    # Dimensions are drawn jointly with the category, and missing ones are 'Unassigned'
+    assert set(generated.loc[generated['Risk Category'] == 'Cyber', 'Business Unit']) == {'Technology'}
+    assert set(generated['Period']) == {'Unassigned'}
+
+    for category in ['Cyber', 'Fraud']:
+        observed = history.loc[history['Risk Category'] == category, 'Initial Impact (Financial)']
+        simulated = generated.loc[generated['Risk Category'] == category, 'Initial Impact (Financial)']
+        for q in [0.1, 0.5, 0.9, 0.99]:
+            assert simulated.quantile(q) == pytest.approx(observed.quantile(q), rel=0.05)
+        assert simulated.min() >= observed.min() and simulated.max() <= observed.max()
+
+    # Integer-valued history columns stay on their observed values
+    reputational = generated['Initial Impact (Reputational)']
+    assert set(reputational.unique()) <= set(range(1, 6))
+    np.testing.assert_allclose(reputational.value_counts(normalize=True).sort_index().to_numpy(), 0.2, atol=0.01)
+
+def test_generation_is_reproducible(history):
+    model = fit_empirical_model(history, num_knots=64)
+    pd.testing.assert_frame_equal(generate_from_history(model, 1000, seed=5), generate_from_history(model, 1000, seed=5))
+
+def test_fit_rejects_incomplete_history(history):
+    with pytest.raises(KeyError):
+        fit_empirical_model(history.drop(columns=['Initial Likelihood']))
+    history.loc[history['Risk Category'] == 'Fraud', 'Initial Impact (Operational)'] = np.nan
+    with pytest.raises(ValueError):
+        fit_empirical_model(history)
@@ -0,0 +1,126 @@
+import pytest
+import pandas as pd
+import numpy as np
+from application_pages.insurance_tower import (
+    EXAMPLE_TOWER, tower_from_params, tower_payouts, apply_tower, price_tower
+)
+from application_pages.simulation_engine import simulate_outcomes
+from application_pages.stress_testing import run_stress_test
+from application_pages.page2 import simulate_scenario_outcome
+
+THRESHOLDS = {
+    'Max Acceptable Financial Loss per Incident': 50000.0,
+    'Max Acceptable Incidents per Period': 3,
+    'Max Acceptable Reputational Impact Score': 3.0
+}
+
+def _loop_payouts(losses, tower):
+    """Reference: pays each layer scenario by scenario, tracking its remaining aggregate limit."""
+    payouts = np.zeros((len(tower), len(losses)))
+    for i, layer in enumerate(tower):
+        limit = layer['Limit ($)'] if layer['Limit ($)'] is not None else np.inf
+        remaining = layer['Aggregate Limit ($)'] if layer['Aggregate Limit ($)'] is not None else np.inf
+        for j, loss in enumerate(losses):
+            paid = min(layer['Share (%)'] * min(max(loss - layer['Attachment ($)'], 0.0), limit), remaining)
+            payouts[i, j] = paid
+            remaining -= paid
+    return payouts
+
+TOWER = [
+    {'Attachment ($)': 1000.0, 'Limit ($)': 9000.0, 'Share (%)': 1.0, 'Aggregate Limit ($)': None},
+    {'Attachment ($)': 10000.0, 'Limit ($)': 40000.0, 'Share (%)': 0.6, 'Aggregate Limit ($)': 100000.0},
+    {'Attachment ($)': 50000.0, 'Limit ($)': None, 'Share (%)': 0.25, 'Aggregate Limit ($)': 30000.0},
+]
+
+def test_tower_payouts_match_loop():
+    losses = np.random.default_rng(0).lognormal(9, 1.5, 500)
+    payouts, used = tower_payouts(losses, TOWER)
+    np.testing.assert_allclose(payouts, _loop_payouts(losses, TOWER))
+    assert payouts[1].sum() == pytest.approx(100000.0)
+    np.testing.assert_allclose(apply_tower(losses, TOWER), losses - payouts.sum(axis=0))
+
+def test_aggregate_limits_carry_across_chunks():
+    losses = np.random.default_rng(1).lognormal(9, 1.5, 500)
+    whole, _ = tower_payouts(losses, TOWER)
+    first, used = tower_payouts(losses[:123], TOWER)
+    second, _ = tower_payouts(losses[123:], TOWER, used)
+    np.testing.assert_allclose(np.concatenate([first, second], axis=1), whole)
+
+def test_legacy_parameters_are_a_single_layer():
+    params = {'Insurance Deductible ($)': 10000.0, 'Insurance Coverage Ratio (%)': 0.8}
+    assert tower_from_params(params)[0]['Attachment ($)'] == 10000.0
+    losses = np.array([0.0, 5000.0, 10000.0, 60000.0])
+    np.testing.assert_allclose(apply_tower(losses, tower_from_params(params)), [0.0, 5000.0, 10000.0, 20000.0])
+
+def test_scenario_outcome_and_batch_agree_on_towers():
+    scenarios = pd.DataFrame({
+        'Scenario ID': [1, 2, 3],
+        'Risk Category': ['Financial', 'Operational', 'Strategic'],
+        'Initial Likelihood': [0.5, 0.2, 0.1],
+        'Initial Impact (Financial)': [5000.0, 30000.0, 120000.0],
+        'Initial Impact (Reputational)': [2.0, 4.0, 1.0],
+        'Initial Impact (Operational)': [1.0, 2.0, 5.0],
+    })
+    params = {'Insurance Tower': TOWER}
+    batch = simulate_outcomes(scenarios, 'Transfer', params, THRESHOLDS)
+    single = [simulate_scenario_outcome(row, 'Transfer', params, THRESHOLDS)['Residual Financial Impact']
+              for _, row in scenarios.iterrows()]
+    # 30000: 9000 from layer 1, 0.6 x 20000 from layer 2; 120000 adds 0.25 x 70000 from layer 3
+    expected = [1000.0, 30000.0 - 9000.0 - 12000.0, 120000.0 - 9000.0 - 24000.0 - 17500.0]
+    np.testing.assert_allclose(batch['Residual Financial Impact'], expected)
+    np.testing.assert_allclose(single, expected)
+
+def test_price_tower():
+    scenarios = pd.DataFrame({
+        'Initial Likelihood': [0.5, 0.1, 1.0],
+        'Initial Impact (Financial)': [20000.0, 300000.0, 500.0],
+    })
+    priced = price_tower(scenarios, TOWER)
+    assert priced['Layer'].tolist() == [1, 2, 3]
+    np.testing.assert_allclose(priced['Total Payout'], [18000.0, 6000.0 + 24000.0, 30000.0])
+    np.testing.assert_allclose(priced['Expected Payout'], [0.5 * 9000 + 0.1 * 9000, 0.5 * 6000 + 0.1 * 24000, 0.1 * 30000])
+    assert priced['Aggregate Exhausted'].tolist() == [False, False, True]
+    assert np.isinf(priced.loc[2, 'Limit ($)'])
+
+def test_example_tower_from_editor_and_invalid_towers():
+    losses = np.array([1000.0, 50000.0, 1e6])
+    payouts, _ = tower_payouts(losses, EXAMPLE_TOWER)
+    assert payouts.shape == (3, 3)
+    with pytest.raises(ValueError):
+        tower_payouts(losses, [{'Attachment ($)': -1.0, 'Share (%)': 0.5}])
+    with pytest.raises(ValueError):
+        tower_payouts(losses, [{'Attachment ($)': 0.0, 'Share (%)': 1.5}])
+    for malformed in [['abc'], 'abc', {'Attachment ($)': 0.0}, [None]]:
+        with pytest.raises(ValueError):
+            tower_payouts(losses, malformed)
+
+def test_stress_coverage_shift_moves_every_layer_share():
+    scenarios = pd.DataFrame({
+        'Risk Category': ['Financial'] * 3,
+        'Initial Likelihood': [0.5, 0.5, 0.5],
+        'Initial Impact (Financial)': [20000.0, 60000.0, 200000.0],
+        'Initial Impact (Reputational)': [1.0, 1.0, 1.0],
+        'Initial Impact (Operational)': [1.0, 1.0, 1.0],
+    })
+    stress_table = pd.DataFrame([
+        {'Stress Scenario': 'Baseline', 'Risk Category': 'All'},
+        {'Stress Scenario': 'Hard Market', 'Risk Category': 'All', 'Coverage Shift': -0.2},
+    ])
+    results = run_stress_test(scenarios, stress_table, 'Transfer', {'Insurance Tower': TOWER}, THRESHOLDS,
+                              memory_budget_mb=1e-5)
+    hard_market = [dict(layer, **{'Share (%)': max(layer['Share (%)'] - 0.2, 0.0)}) for layer in TOWER]
+    expected = [
+        apply_tower(scenarios['Initial Impact (Financial)'].to_numpy(), tower).sum() for tower in [TOWER, hard_market]
+    ]
+    np.testing.assert_allclose(results['Total Residual Financial Impact'], expected)
+
+def test_pricing_a_million_scenarios_is_fast():
+    import time
+    rng = np.random.default_rng(2)
+    scenarios = pd.DataFrame({
+        'Initial Likelihood': rng.random(1_000_000),
+        'Initial Impact (Financial)': rng.lognormal(9, 2, 1_000_000),
+    })
+    start = time.perf_counter()
+    price_tower(scenarios, TOWER)
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,92 @@
+import os
+import pytest
+from streamlit.testing.v1 import AppTest
+from application_pages.page1 import generate_synthetic_data
+from application_pages.simulation_engine import LOG_COLUMNS
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+def _widget(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+@pytest.fixture
+def scenario_page():
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.session_state['synthetic_data'] = generate_synthetic_data(20, seed=3)
+    at.run()
+    _widget(at.selectbox, "Navigation").set_value("Scenario Simulation").run()
+    return at
+
+def test_session_initialized_once_with_log_columns():
+    at = AppTest.from_file(APP_PATH, default_timeout=60).run()
+    assert not at.exception
+    assert at.session_state['_session_initialized']
+    assert list(at.session_state['simulation_log'].columns) == LOG_COLUMNS
+    assert at.session_state['risk_appetite_rules'] == []
+
+def test_thresholds_rewritten_only_on_change():
+    at = AppTest.from_file(APP_PATH, default_timeout=60).run()
+    version = at.session_state['risk_appetite_thresholds_version']
+    at.run()
+    assert at.session_state['risk_appetite_thresholds_version'] == version
+    _widget(at.number_input, "Max Acceptable Incidents per Period").set_value(4).run()
+    assert at.session_state['risk_appetite_thresholds']['Max Acceptable Incidents per Period'] == 4
+    assert at.session_state['risk_appetite_thresholds_version'] == version + 1
+
+def test_simulation_updates_log_and_reports_outcome(scenario_page):
+    at = scenario_page
+    _widget(at.selectbox, "Select Scenario to Simulate").set_value(5).run()
+    _widget(at.selectbox, "Choose Risk Management Action").set_value("Eliminate").run()
+    _widget(at.button, "Run Simulation").click().run()
+    assert not at.exception
+    log = at.session_state['simulation_log']
+    assert log['Scenario ID'].tolist() == [5]
+    assert log['Residual Financial Impact'].tolist() == [0.0]
+    assert at.session_state['simulation_log_version'] == 1
+    assert "Scenario ID 5 added/updated in simulation log." in [message.value for message in at.success]
+    assert 'Outcome panel' in at.session_state['interaction_timings']
+
+def test_large_universe_uses_scenario_id_input():
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    data = generate_synthetic_data(20_000, seed=4)
+    data['Scenario ID'] = data['Scenario ID'] * 2
+    at.session_state['synthetic_data'] = data
+    at.run()
+    _widget(at.selectbox, "Navigation").set_value("Scenario Simulation").run()
+    scenario_input = _widget(at.number_input, "Select Scenario to Simulate")
+    scenario_input.set_value(7).run()
+    assert "Scenario ID 7 does not exist." in [message.value for message in at.warning]
+    _widget(at.number_input, "Select Scenario to Simulate").set_value(40).run()
+    _widget(at.button, "Run Simulation").click().run()
+    log = at.session_state['simulation_log']
+    assert log['Scenario ID'].tolist() == [40]
+    assert log['Initial Financial Impact'].tolist() == [data.loc[data['Scenario ID'] == 40, 'Initial Impact (Financial)'].iloc[0]]
+
+def test_generating_data_bumps_version_and_refreshes_lookup():
+    at = AppTest.from_file(APP_PATH, default_timeout=60).run()
+    _widget(at.text_input, "Random Seed (optional)").set_value("1").run()
+    _widget(at.slider, "Number of Scenarios").set_value(30).run()
+    _widget(at.button, "Generate Data").click().run()
+    assert at.session_state['synthetic_data_version'] == 1
+    _widget(at.selectbox, "Navigation").set_value("Scenario Simulation").run()
+    assert len(_widget(at.selectbox, "Select Scenario to Simulate").options) == 30
+    assert at.session_state['_scenario_lookup']['universe_version'] == 1
+
+    _widget(at.selectbox, "Navigation").set_value("Data Generation & Risk Appetite").run()
+    _widget(at.slider, "Number of Scenarios").set_value(40).run()
+    _widget(at.button, "Generate Data").click().run()
+    assert at.session_state['synthetic_data_version'] == 2
+    _widget(at.selectbox, "Navigation").set_value("Scenario Simulation").run()
+    assert len(_widget(at.selectbox, "Select Scenario to Simulate").options) == 40
+
+def test_bootstrap_reruns_only_when_log_or_settings_change(scenario_page):
+    at = scenario_page
+    _widget(at.button, "Run Simulation").click().run()
+    _widget(at.selectbox, "Navigation").set_value("Impact Analysis").run()
+    assert not at.exception
+    cached = at.session_state['bootstrap_results']
+    assert cached[0] == (1, 1000, 0.95)
+    at.run()
+    assert at.session_state['bootstrap_results'][1] is cached[1]
+    _widget(at.selectbox, "Confidence Level").set_value(0.90).run()
+    assert at.session_state['bootstrap_results'][0] == (1, 1000, 0.90)
@@ -0,0 +1,45 @@
+import pytest
+import pandas as pd
+import numpy as np
+from application_pages.table_view import filter_sort_positions, get_page
+
+@pytest.fixture
+def sample_table():
+    return pd.DataFrame({
+        'Scenario ID': [1, 2, 3, 4, 5, 6],
+        'Risk Category': ['A', 'B', 'A', 'C', 'B', 'A'],
+        'Residual Financial Impact': [30.0, 10.0, 20.0, 10.0, 50.0, 10.0],
+        'Financial Compliance': [True, False, True, True, False, True]
+    })
+
+def test_filter_sort_positions_no_filters(sample_table):
+    positions = filter_sort_positions(sample_table)
+    assert positions.tolist() == [0, 1, 2, 3, 4, 5]
+
+def test_filter_sort_positions_filters(sample_table):
+    positions = filter_sort_positions(sample_table, {'Risk Category': ['A', 'B'], 'Financial Compliance': [True]})
+    assert sample_table.iloc[positions]['Scenario ID'].tolist() == [1, 3, 6]
+
+def test_filter_sort_positions_sort_is_stable_both_ways(sample_table):
+    ascending = filter_sort_positions(sample_table, sort_by='Residual Financial Impact')
+    descending = filter_sort_positions(sample_table, sort_by='Residual Financial Impact', ascending=False)
+    assert sample_table.iloc[ascending]['Scenario ID'].tolist() == [2, 4, 6, 3, 1, 5]
+    assert sample_table.iloc[descending]['Scenario ID'].tolist() == [5, 1, 3, 2, 4, 6]
+
+def test_filter_sort_positions_sort_object_column(sample_table):
+    positions = filter_sort_positions(sample_table, sort_by='Risk Category')
+    assert sample_table.iloc[positions]['Risk Category'].tolist() == ['A', 'A', 'A', 'B', 'B', 'C']
+
+def test_filter_sort_positions_missing_column(sample_table):
+    with pytest.raises(KeyError):
+        filter_sort_positions(sample_table, {'Missing': ['x']})
+    with pytest.raises(KeyError):
+        filter_sort_positions(sample_table, sort_by='Missing')
+
+def test_get_page_slices_and_clamps(sample_table):
+    positions = np.arange(len(sample_table))
+    assert get_page(sample_table, positions, 2, 4)['Scenario ID'].tolist() == [5, 6]
+    assert get_page(sample_table, positions, 99, 4)['Scenario ID'].tolist() == [5, 6]
+    assert get_page(sample_table, positions, 0, 4)['Scenario ID'].tolist() == [1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        get_page(sample_table, positions, 1, 0)
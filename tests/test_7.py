@@ -0,0 +1,67 @@
+import pytest
+import pandas as pd
+from application_pages.simulation_engine import simulate_outcomes
+from application_pages.policy_runs import create_policy_store, save_policy_run, compare_policy_runs
+
+@pytest.fixture
+def sample_scenarios():
+    return pd.DataFrame({
+        'Scenario ID': [3, 1, 2, 4],
+        'Risk Category': ['Financial', 'Strategic', 'Financial', 'Operational'],
+        'Initial Likelihood': [0.5, 0.2, 0.8, 0.1],
+        'Initial Impact (Financial)': [60000.0, 10000.0, 80000.0, 40000.0],
+        'Initial Impact (Reputational)': [6.0, 2.0, 8.0, 4.0],
+        'Initial Impact (Operational)': [5.0, 1.0, 20.0, 3.0]
+    })
+
+@pytest.fixture
+def sample_thresholds():
+    return {
+        'Max Acceptable Financial Loss per Incident': 50000.0,
+        'Max Acceptable Incidents per Period': 10,
+        'Max Acceptable Reputational Impact Score': 5.0
+    }
+
+def test_simulate_outcomes_transfer(sample_scenarios, sample_thresholds):
+    params = {'Insurance Deductible ($)': 1000.0, 'Insurance Coverage Ratio (%)': 0.5}
+    outcomes = simulate_outcomes(sample_scenarios, 'Transfer', params, sample_thresholds)
+    assert outcomes['Residual Financial Impact'].tolist() == [30500.0, 5500.0, 40500.0, 20500.0]
+    assert outcomes['Financial Compliance'].all()
+    assert outcomes['Operational Compliance'].tolist() == [True, True, False, True]
+
+def test_simulate_outcomes_invalid_action(sample_scenarios, sample_thresholds):
+    with pytest.raises(ValueError):
+        simulate_outcomes(sample_scenarios, 'Invalid Action', {}, sample_thresholds)
+
+def test_compare_policy_runs(sample_scenarios, sample_thresholds):
+    store = create_policy_store(sample_scenarios)
+    save_policy_run(store, 'accept', simulate_outcomes(sample_scenarios, 'Accept', {}, sample_thresholds))
+    mitigated = simulate_outcomes(sample_scenarios, 'Mitigate', {'Mitigation Factor (Impact Reduction %)': 0.5}, sample_thresholds)
+    save_policy_run(store, 'mitigate', mitigated[mitigated['Scenario ID'] != 4])
+
+    comparison = compare_policy_runs(store, ['accept', 'mitigate'])
+    deltas = comparison['deltas'].iloc[0]
+    assert deltas['Scenarios Compared'] == 3
+    assert deltas['Total Residual Financial Delta'] == pytest.approx(-75000.0)
+
+    flips = comparison['compliance_flips'].set_index('Compliance Check')
+    assert flips.loc['Financial Compliance', 'Breach -> Compliant'] == 2
+    assert flips.loc['Reputational Compliance', 'Breach -> Compliant'] == 2
+    assert flips.loc['Financial Compliance', 'Compliant -> Breach'] == 0
+
+    totals = comparison['category_totals']
+    assert totals.loc['Financial', 'accept'] == pytest.approx(140000.0)
+    assert totals.loc['Financial', 'mitigate'] == pytest.approx(70000.0)
+    assert totals.loc['Operational', 'mitigate'] == 0.0
+
+def test_save_policy_run_unknown_scenario(sample_scenarios, sample_thresholds):
+    store = create_policy_store(sample_scenarios)
+    outcomes = simulate_outcomes(sample_scenarios, 'Accept', {}, sample_thresholds)
+    outcomes.loc[0, 'Scenario ID'] = 99
+    with pytest.raises(KeyError):
+        save_policy_run(store, 'bad', outcomes)
+
+def test_compare_policy_runs_needs_two_runs(sample_scenarios):
+    store = create_policy_store(sample_scenarios)
+    with pytest.raises(ValueError):
+        compare_policy_runs(store, ['only'])
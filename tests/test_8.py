@@ -0,0 +1,72 @@
+import pytest
+import pandas as pd
+from application_pages.rule_engine import compile_rules, default_rules, summarize_rule_results
+
+@pytest.fixture
+def sample_log():
+    return pd.DataFrame({
+        'Scenario ID': [1, 2, 3, 4, 5],
+        'Risk Category': ['Financial', 'Financial', 'Strategic', 'Strategic', 'Operational'],
+        'Chosen Action': ['Accept', 'Mitigate', 'Accept', 'Transfer', 'Accept'],
+        'Initial Operational Impact': [2.0, 8.0, 4.0, 1.0, 3.0],
+        'Residual Financial Impact': [40000.0, 30000.0, 5000.0, 60000.0, 20000.0],
+        'Residual Reputational Impact': [2.0, 6.0, 1.0, 4.0, 5.0]
+    })
+
+def test_default_rules_match_thresholds(sample_log):
+    thresholds = {
+        'Max Acceptable Financial Loss per Incident': 35000.0,
+        'Max Acceptable Incidents per Period': 5,
+        'Max Acceptable Reputational Impact Score': 4.5
+    }
+    results = compile_rules(default_rules(thresholds))(sample_log)
+    assert results['Financial Compliance'].tolist() == [False, True, True, False, True]
+    assert results['Operational Compliance'].tolist() == [True, False, True, True, True]
+    assert results['Reputational Compliance'].tolist() == [True, False, True, True, False]
+
+def test_category_scoped_limit(sample_log):
+    rules = [{'name': 'Strategic Limit', 'category': 'Strategic', 'column': 'Residual Financial Impact', 'op': '<=', 'value': 10000}]
+    results = compile_rules(rules)(sample_log)
+    assert results['Strategic Limit'].tolist() == [True, True, True, False, True]
+
+def test_aggregate_limits(sample_log):
+    rules = [
+        {'name': 'Category Total', 'aggregate': 'sum', 'by': 'Risk Category',
+         'column': 'Residual Financial Impact', 'op': '<=', 'value': 65000},
+        {'name': 'Financial Max', 'aggregate': 'max', 'category': 'Financial',
+         'column': 'Residual Reputational Impact', 'op': '<', 'value': 5},
+        {'name': 'Category Count', 'aggregate': 'count', 'column': 'Scenario ID', 'op': '<=', 'value': 1}
+    ]
+    results = compile_rules(rules)(sample_log)
+    assert results['Category Total'].tolist() == [False, False, True, True, True]
+    assert results['Financial Max'].tolist() == [False, False, True, True, True]
+    assert results['Category Count'].tolist() == [False, False, False, False, True]
+
+def test_composite_rules(sample_log):
+    rules = [{'name': 'Accepted Risks Stay Small', 'any': [
+        {'column': 'Chosen Action', 'op': '!=', 'value': 'Accept'},
+        {'all': [
+            {'column': 'Residual Financial Impact', 'op': '<=', 'value': 25000},
+            {'column': 'Residual Reputational Impact', 'op': '<=', 'value': 3}
+        ]}
+    ]}]
+    results = compile_rules(rules)(sample_log)
+    assert results['Accepted Risks Stay Small'].tolist() == [False, True, True, True, False]
+    summary = summarize_rule_results(results)
+    assert summary.loc[0, 'Breaches'] == 2
+
+@pytest.mark.parametrize("rules", [
+    [{'column': 'Residual Financial Impact', 'value': 1}],
+    [{'name': 'a', 'column': 'Residual Financial Impact', 'op': '~', 'value': 1}],
+    [{'name': 'a', 'aggregate': 'median', 'column': 'Residual Financial Impact', 'value': 1}],
+    [{'name': 'a', 'all': []}],
+    [{'name': 'a', 'column': 'x', 'value': 1}, {'name': 'a', 'column': 'y', 'value': 1}],
+])
+def test_invalid_rules(rules):
+    with pytest.raises(ValueError):
+        compile_rules(rules)
+
+def test_missing_column(sample_log):
+    evaluate = compile_rules([{'name': 'a', 'column': 'Missing', 'value': 1}])
+    with pytest.raises(KeyError):
+        evaluate(sample_log)
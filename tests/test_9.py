@@ -0,0 +1,37 @@
+import pytest
+from application_pages.tail_estimation import (
+    estimate_breach_probability, estimate_tail_risk, lognormal_tail_probability, lognormal_quantile
+)
+
+def test_breach_probability_matches_exact():
+    result = estimate_breach_probability(50000.0, 20000, seed=0)
+    exact = lognormal_tail_probability(50000.0)
+    assert abs(result['Estimate'] - exact) < 4 * result['Standard Error']
+    assert result['Effective Sample Size'] <= result['Trials']
+
+def test_breach_probability_beats_plain_monte_carlo():
+    tilted = estimate_breach_probability(50000.0, 20000, seed=1)
+    plain = estimate_breach_probability(50000.0, 20000, shift=0.0, seed=1)
+    assert tilted['Standard Error'] * 3 < plain['Standard Error']
+    assert tilted['Equivalent Plain Trials'] > 10 * tilted['Trials']
+    assert plain['Effective Sample Size'] == pytest.approx(plain['Trials'])
+
+def test_tail_risk_matches_exact():
+    result = estimate_tail_risk(0.999, 50000, seed=2)
+    assert abs(result['VaR'] - lognormal_quantile(0.999)) < 4 * result['VaR Standard Error']
+    # E[X | X > VaR] for a lognormal(5, 2) at 99.9%
+    assert result['Expected Shortfall'] == pytest.approx(151122.0, rel=0.02)
+    assert result['Expected Shortfall'] > result['VaR']
+
+@pytest.mark.parametrize("kwargs", [
+    {'threshold': 0.0, 'num_trials': 100},
+    {'threshold': 100.0, 'num_trials': 1},
+    {'threshold': 100.0, 'num_trials': 100, 'sigma': 0.0},
+])
+def test_breach_probability_invalid_inputs(kwargs):
+    with pytest.raises(ValueError):
+        estimate_breach_probability(**kwargs)
+
+def test_tail_risk_invalid_confidence():
+    with pytest.raises(ValueError):
+        estimate_tail_risk(1.0, 100)